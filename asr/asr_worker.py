@@ -0,0 +1,199 @@
+"""
+Out-of-process ASR: JapaneseASR in a worker process fed through shared memory
+"""
+import atexit
+import multiprocessing as mp
+import queue
+from multiprocessing import shared_memory
+import numpy as np
+
+
+class ASRWorkerError(RuntimeError):
+    """The worker process failed to start or died; the ProcessASR is closed."""
+
+
+class SharedAudioRing:
+    """Single-producer/single-consumer ring of float32 samples in shared memory.
+
+    The first 16 bytes hold two int64 counters: total samples written and
+    total samples read. Each side only ever advances its own counter, after
+    copying the data, so no lock is needed between the two processes.
+    """
+    HEADER_BYTES = 16
+
+    def __init__(self, capacity, name=None, create=True):
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=create, size=self.HEADER_BYTES + capacity * 4
+        )
+        self._counters = np.ndarray((2,), dtype=np.int64, buffer=self.shm.buf[:self.HEADER_BYTES])
+        self._data = np.ndarray((capacity,), dtype=np.float32, buffer=self.shm.buf[self.HEADER_BYTES:])
+        if create:
+            self._counters[:] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def free(self):
+        return self.capacity - int(self._counters[0] - self._counters[1])
+
+    def write(self, samples):
+        n = len(samples)
+        if n > self.free():
+            raise BufferError(f"ring full: {n} samples, {self.free()} free")
+        start = int(self._counters[0] % self.capacity)
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = samples[:first]
+        self._data[:n - first] = samples[first:]
+        self._counters[0] += n
+
+    def read(self, n):
+        start = int(self._counters[1] % self.capacity)
+        first = min(n, self.capacity - start)
+        out = np.empty(n, dtype=np.float32)
+        out[:first] = self._data[start:start + first]
+        out[first:] = self._data[:n - first]
+        self._counters[1] += n
+        return out
+
+    def close(self):
+        # Views into the buffer must go before the mapping can be closed
+        del self._counters, self._data
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+
+def _worker_main(model_path, ring_name, capacity, commands, results):
+    ring = SharedAudioRing(capacity, name=ring_name, create=False)
+    try:
+        from asr.jp_asr import JapaneseASR
+        asr = JapaneseASR(model_path=model_path)
+    except Exception as e:
+        results.put(("error", repr(e), None))
+        ring.close()
+        return
+    results.put(("ready", None, None))
+    try:
+        while True:
+            op, n = commands.get()
+            if op == "chunk":
+                results.put(asr.recognize_timed(ring.read(n)))
+            elif op == "partial":
+                results.put((asr.partial(), None, None))
+            elif op == "flush":
+                results.put(asr.flush())
+            elif op == "reset":
+                asr.reset()
+            elif op == "stop":
+                break
+    finally:
+        ring.close()
+
+
+class ProcessASR:
+    """Drop-in JapaneseASR replacement that decodes in a dedicated process.
+
+    Audio goes through a SharedAudioRing, so chunks are never pickled; only
+    tiny (op, sample count) commands and (text, start, end) result records
+    cross the process boundary. The calling thread blocks on the result queue
+    without holding the GIL, so Qt and VLC keep running in the meantime.
+    If the worker fails to load the model or dies, calls raise ASRWorkerError
+    instead of waiting forever.
+    """
+    POLL_SECONDS = 0.5
+
+    def __init__(self, model_path, ring_seconds=10.0, samplerate=16000):
+        # spawn, not fork: the parent has Qt, VLC and worker threads running
+        ctx = mp.get_context("spawn")
+        capacity = int(ring_seconds * samplerate)
+        self.ring = SharedAudioRing(capacity)
+        self._commands = ctx.Queue()
+        self._results = ctx.Queue()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(model_path, self.ring.name, capacity, self._commands, self._results),
+            name="holoyomi-asr",
+            daemon=True,
+        )
+        self.process.start()
+        self._closed = False
+        atexit.register(self.close)
+        status, error, _ = self._result()  # wait until the model is loaded
+        if status == "error":
+            self.close()
+            raise ASRWorkerError(f"ASR worker could not load {model_path}: {error}")
+        print(f"[INFO] ASR worker process {self.process.pid} ready")
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def _result(self):
+        while True:
+            try:
+                return self._results.get(timeout=self.POLL_SECONDS)
+            except queue.Empty:
+                pass
+            if self._closed:
+                raise ASRWorkerError("ASR worker is closed")
+            if not self.process.is_alive():
+                try:
+                    return self._results.get(timeout=self.POLL_SECONDS)  # sent just before exiting
+                except queue.Empty:
+                    pass
+                exitcode = self.process.exitcode
+                self.close()
+                raise ASRWorkerError(f"ASR worker process exited with code {exitcode}")
+
+    def _send(self, op, n=0):
+        if self._closed:
+            raise ASRWorkerError("ASR worker is closed")
+        self._commands.put((op, n))
+
+    def reset(self):
+        self._send("reset")
+
+    def recognize(self, audio_chunk):
+        return self.recognize_timed(audio_chunk)[0]
+
+    def recognize_timed(self, audio_chunk):
+        if self._closed:
+            raise ASRWorkerError("ASR worker is closed")
+        self.ring.write(audio_chunk)
+        self._send("chunk", len(audio_chunk))
+        return self._result()
+
+    def partial(self):
+        self._send("partial")
+        return self._result()[0]
+
+    def flush(self):
+        self._send("flush")
+        return self._result()
+
+    def close(self):
+        """Stop the worker and release its process, queues and shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        if self.process.is_alive():
+            self._commands.put(("stop", 0))
+            self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        # Nobody reads the commands any more; don't wait for their feeder to flush
+        self._commands.cancel_join_thread()
+        for q in (self._commands, self._results):
+            q.close()
+            q.join_thread()
+        self.process.close()
+        self.ring.close()
+        self.ring.unlink()
@@ -1,17 +1,60 @@
 import json
+import threading
 import numpy as np
 from vosk import Model, KaldiRecognizer
 
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_model(model_path):
+    """Load a Vosk model once per path; recognizers for every stream share it."""
+    with _models_lock:
+        if model_path not in _models:
+            _models[model_path] = Model(model_path)
+        return _models[model_path]
+
+
 class JapaneseASR:
     def __init__(self, model_path):
-        self.model = Model(model_path)
+        self.model = load_model(model_path)
+        self.reset()
+
+    def reset(self):
+        """Drop any half-decoded utterance and start a fresh recognizer.
+
+        Word timings reported by recognize_timed() restart from zero.
+        """
         self.recognizer = KaldiRecognizer(self.model, 16000)
+        self.recognizer.SetWords(True)
 
     def recognize(self, audio_chunk):
+        return self.recognize_timed(audio_chunk)[0]
+
+    def recognize_timed(self, audio_chunk):
+        """Return (text, start, end) for a finished utterance, else ("", None, None).
+
+        start/end are seconds since the last reset(), or None when the
+        recognizer reported no word timings.
+        """
         # audio_chunk: numpy array (float32)
         pcm = (audio_chunk * 32767).astype(np.int16).tobytes()
 
         if self.recognizer.AcceptWaveform(pcm):
-            result = json.loads(self.recognizer.Result())
-            return result.get("text", "")
-        return ""
\ No newline at end of file
+            return self._timed_result(self.recognizer.Result())
+        return "", None, None
+
+    def partial(self):
+        """Best guess for the utterance still being decoded."""
+        return json.loads(self.recognizer.PartialResult()).get("partial", "")
+
+    def flush(self):
+        """Finalize the pending utterance; same return value as recognize_timed()."""
+        return self._timed_result(self.recognizer.FinalResult())
+
+    def _timed_result(self, raw):
+        result = json.loads(raw)
+        words = result.get("result") or []
+        if words:
+            return result.get("text", ""), words[0]["start"], words[-1]["end"]
+        return result.get("text", ""), None, None
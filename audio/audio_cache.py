@@ -0,0 +1,105 @@
+"""
+Content-addressed store of decoded audio for media files
+"""
+import hashlib
+import os
+import uuid
+
+import ffmpeg
+
+from config import AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES, SAMPLERATE
+
+PCM_SUFFIX = ".pcm"
+_HASH_BLOCK = 1 << 20
+
+
+def media_hash(path):
+    """Hash a media file by its size and sampled blocks from the start, middle and end.
+
+    Reading the whole of a multi-GB VOD would take longer than extracting its
+    audio, and the sampled blocks plus the exact size are enough to tell
+    different files apart.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, "rb") as f:
+        for offset in (0, max(0, size // 2 - _HASH_BLOCK // 2), max(0, size - _HASH_BLOCK)):
+            f.seek(offset)
+            digest.update(f.read(_HASH_BLOCK))
+    return digest.hexdigest()[:32]
+
+
+class AudioCache:
+    """Mono 16-bit PCM extracted from media, stored once per media hash.
+
+    Files are raw little-endian s16 at SAMPLERATE so AudioFileCapture can
+    numpy.memmap them and slice any offset without decoding. The directory is
+    kept under max_bytes by evicting the least recently used entries.
+    """
+
+    def __init__(self, cache_dir=AUDIO_CACHE_DIR, max_bytes=AUDIO_CACHE_MAX_BYTES, samplerate=SAMPLERATE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.samplerate = samplerate
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, key + PCM_SUFFIX)
+
+    def get(self, media_path, threads=0, process_hook=None):
+        """Return the cached PCM path for media_path, extracting it on first use.
+
+        threads caps ffmpeg's decoding threads (0 lets ffmpeg choose);
+        process_hook(pid) is called once the ffmpeg process has started, e.g.
+        to lower its priority.
+        """
+        key = media_hash(media_path)
+        pcm_path = self.path_for(key)
+        if os.path.exists(pcm_path):
+            os.utime(pcm_path)  # mark as recently used
+            return pcm_path
+
+        # Extract to a private name and rename, so concurrent players opening
+        # the same file never read a half-written entry
+        tmp_path = f"{pcm_path}.{uuid.uuid4().hex}.tmp"
+        print(f"[INFO] Extracting audio to {pcm_path}...")
+        try:
+            process = (
+                ffmpeg
+                .input(media_path, threads=threads)
+                .output(tmp_path, format='s16le', acodec='pcm_s16le', ac=1, ar=self.samplerate, loglevel='error')
+                .overwrite_output()
+                .run_async()
+            )
+            if process_hook:
+                process_hook(process.pid)
+            if process.wait():
+                raise ffmpeg.Error('ffmpeg', None, None)
+            os.replace(tmp_path, pcm_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        print("[INFO] Audio extraction complete")
+        self.evict(keep=pcm_path)
+        return pcm_path
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(PCM_SUFFIX):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                print(f"[INFO] Evicted cached audio {os.path.basename(path)}")
+            except OSError as e:
+                print(f"[WARNING] Could not evict {path}: {e}")
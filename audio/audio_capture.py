@@ -1 +1,78 @@
-# Audio capture module
\ No newline at end of file
+import threading
+import time
+from collections import deque
+import numpy as np
+import sounddevice as sd
+
+class AudioCapture:
+    """Live microphone / loopback capture in float32 chunks.
+
+    The device delivers short blocks, each stamped with the monotonic time it
+    finished recording; get_chunk() joins blocks up to the current chunk size,
+    so the size can change at runtime and the consumer can tell how far behind
+    realtime it is running.
+    """
+    BLOCK_SECONDS = 0.05
+
+    def __init__(self, chunk_duration=1.0, samplerate=16000, device=None):
+        self.samplerate = samplerate
+        self.chunk_size = int(chunk_duration * samplerate)
+        self._chunks = deque()  # (captured_at, samples) per device block
+        self._cond = threading.Condition()
+        self.last_captured_at = None
+        self.stream = sd.InputStream(
+            samplerate=samplerate, channels=1, dtype="float32",
+            blocksize=int(self.BLOCK_SECONDS * samplerate), device=device, callback=self._callback,
+        )
+        self.stream.start()
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            print(f"[AUDIO] {status}")
+        with self._cond:
+            self._chunks.append((time.monotonic(), indata[:, 0].copy()))
+            self._cond.notify()
+
+    def get_chunk(self, timeout=None):
+        """Next chunk_size samples in capture order, or None if they didn't arrive within timeout."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while sum(len(block) for _, block in self._chunks) < self.chunk_size:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            parts = []
+            needed = self.chunk_size
+            while needed > 0:
+                captured_at, block = self._chunks.popleft()
+                if len(block) > needed:
+                    # Keep the tail of a split block at the head of the queue
+                    self._chunks.appendleft((captured_at, block[needed:]))
+                    block = block[:needed]
+                parts.append(block)
+                needed -= len(block)
+                self.last_captured_at = captured_at
+        return np.concatenate(parts)
+
+    def set_chunk_duration(self, chunk_duration):
+        self.chunk_size = max(1, int(chunk_duration * self.samplerate))
+
+    def lag(self):
+        """Seconds between the last returned chunk being recorded and now."""
+        if self.last_captured_at is None:
+            return 0.0
+        return time.monotonic() - self.last_captured_at
+
+    def drop_stale(self, max_age):
+        """Discard queued chunks older than max_age seconds; returns seconds of audio dropped."""
+        dropped = 0
+        now = time.monotonic()
+        with self._cond:
+            while self._chunks and now - self._chunks[0][0] > max_age:
+                dropped += len(self._chunks.popleft()[1])
+        return dropped / self.samplerate
+
+    def close(self):
+        self.stream.stop()
+        self.stream.close()
@@ -1,15 +1,26 @@
+import os
 import numpy as np
 from pydub import AudioSegment
 
+from audio.audio_cache import PCM_SUFFIX
+
 class AudioFileCapture:
     def __init__(self, filename, chunk_duration=1.0, samplerate=16000):
         self.filename = filename
         self.samplerate = samplerate
         self.chunk_size = int(chunk_duration * samplerate)
-        # Load audio file (mp3, wav, mp4, etc.)
-        audio = AudioSegment.from_file(filename)
-        audio = audio.set_channels(1).set_frame_rate(samplerate)
-        self.samples = np.array(audio.get_array_of_samples()).astype(np.float32) / 32768.0
+        if filename.endswith(PCM_SUFFIX):
+            # Raw s16 from AudioCache: memory-map it so only the slices being
+            # read are paged in, and other readers share the page cache
+            if os.path.getsize(filename) > 0:
+                self.samples = np.memmap(filename, dtype=np.int16, mode="r")
+            else:
+                self.samples = np.zeros(0, dtype=np.int16)
+        else:
+            # Load audio file (mp3, wav, mp4, etc.)
+            audio = AudioSegment.from_file(filename)
+            audio = audio.set_channels(1).set_frame_rate(samplerate).set_sample_width(2)
+            self.samples = np.array(audio.get_array_of_samples(), dtype=np.int16)
         self.total_samples = len(self.samples)
         self.position = 0
 
@@ -17,6 +28,21 @@ class AudioFileCapture:
         if self.position >= self.total_samples:
             return None
         end = min(self.position + self.chunk_size, self.total_samples)
-        chunk = self.samples[self.position:end]
+        chunk = self.samples[self.position:end].astype(np.float32) / 32768.0
         self.position = end
         return chunk
+
+    def set_chunk_duration(self, chunk_duration):
+        self.chunk_size = max(1, int(chunk_duration * self.samplerate))
+
+    def seek(self, seconds):
+        """Move the read position to the given offset in seconds."""
+        self.position = max(0, min(int(seconds * self.samplerate), self.total_samples))
+
+    def tell(self):
+        """Current read position in seconds."""
+        return self.position / self.samplerate
+
+    @property
+    def duration(self):
+        return self.total_samples / self.samplerate
@@ -0,0 +1,282 @@
+"""
+Spectral audio fingerprints for finding audio we have already transcribed
+"""
+import os
+
+import numpy as np
+
+from config import TRANSCRIPT_CACHE_MAX_BYTES
+
+FRAME = 2048  # samples per analysis frame (128 ms at 16 kHz)
+HOP = 512     # samples between frames (32 ms)
+BANDS = 33    # log-spaced bands between 300 and 3000 Hz -> 32 bits per frame
+BLOCK_FRAMES = 1024
+MAX_POSTINGS = 64  # hashes this common (silence, hum) carry no information
+QUERY_SHIFTS = 4   # a query is also fingerprinted 1/4, 1/2 and 3/4 of a hop late
+ENTRY_SUFFIXES = (".npy", ".json")  # a file's fingerprint and the transcript saved next to it
+
+
+def _band_edges(samplerate):
+    freqs = np.geomspace(300.0, 3000.0, BANDS + 1)
+    return np.round(freqs * FRAME / samplerate).astype(np.int64)
+
+
+def fingerprint(samples, samplerate=16000):
+    """One uint32 sub-fingerprint per HOP samples (Haitsma-Kalker style).
+
+    Bit m of frame n is set when the energy difference between bands m and
+    m+1 grew since frame n-1. The bits only depend on the shape of the
+    spectrum, so re-encoding and volume changes flip few of them. samples
+    may be an int16 memmap; it is read in blocks.
+    """
+    count = (len(samples) - FRAME) // HOP + 1
+    if count < 2:
+        return np.zeros(0, dtype=np.uint32)
+    edges = _band_edges(samplerate)
+    window = np.hanning(FRAME).astype(np.float32)
+    weights = (1 << np.arange(BANDS - 1, dtype=np.uint64))
+    out = np.empty(count - 1, dtype=np.uint32)
+    previous = None
+    for first in range(0, count, BLOCK_FRAMES):
+        n = min(BLOCK_FRAMES, count - first)
+        block = np.asarray(samples[first * HOP:(first + n - 1) * HOP + FRAME], dtype=np.float32)
+        frames = np.lib.stride_tricks.sliding_window_view(block, FRAME)[::HOP]
+        power = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+        energy = np.add.reduceat(power[:, edges[0]:edges[-1]], edges[:-1] - edges[0], axis=1)
+        diff = energy[:, :-1] - energy[:, 1:]
+        if previous is not None:
+            diff = np.vstack([previous, diff])
+        bits = (diff[1:] - diff[:-1]) > 0
+        start = first - 1 if previous is not None else 0
+        out[start:start + len(bits)] = (bits @ weights).astype(np.uint32)
+        previous = diff[-1:]
+    return out
+
+
+def shifted_fingerprints(samples, samplerate=16000, shifts=QUERY_SHIFTS):
+    """[(shift_seconds, fingerprint)] of samples starting 0, 1/shifts, ... of a hop late.
+
+    Hashes only agree between copies whose frames start at about the same
+    point, and a clip can be cut anywhere within a hop. One of these shifts
+    is always within HOP / (2 * shifts) samples of the indexed copy's grid.
+    """
+    step = HOP // shifts
+    return [(k * step / samplerate, fingerprint(samples[k * step:], samplerate)) for k in range(shifts)]
+
+
+def frames_to_seconds(frames, samplerate=16000):
+    return frames * HOP / samplerate
+
+
+def _popcount(x):
+    x = x - ((x >> 1) & 0x55555555)
+    x = (x & 0x33333333) + ((x >> 2) & 0x33333333)
+    x = (x + (x >> 4)) & 0x0F0F0F0F
+    return (x * np.uint32(0x01010101)) >> 24
+
+
+def matching_runs(query, ref, offset, window=94, max_ber=0.35, min_frames=300):
+    """Query frame ranges [a, b) that match ref shifted by offset frames.
+
+    A frame matches when the bit error rate, averaged over `window` frames
+    (~3 s), stays under max_ber. Averaging lets a run spill up to half a
+    window into unrelated audio, so runs are trimmed by that much; runs
+    shorter than min_frames are dropped.
+    """
+    a = max(0, -offset)
+    b = min(len(query), len(ref) - offset)
+    if b - a < min_frames:
+        return []
+    errors = _popcount(np.asarray(query[a:b]) ^ np.asarray(ref[a + offset:b + offset])).astype(np.float32)
+    ber = np.convolve(errors, np.ones(window, dtype=np.float32) / (32 * window), mode="same")
+    matched = np.concatenate([[False], ber < max_ber, [False]])
+    edges = np.flatnonzero(matched[1:] != matched[:-1])
+    trim = window // 2
+    return [(a + s + trim, a + e - trim) for s, e in zip(edges[::2], edges[1::2]) if e - s - 2 * trim >= min_frames]
+
+
+class FingerprintIndex:
+    """Fingerprints of every transcribed media file, keyed by media hash.
+
+    Each file's fingerprint is saved as <key>.npy and memory-mapped back.
+    Lookups go through landmarks: frames whose hash has its two low bits
+    clear. That keeps a quarter of the frames in a sorted in-memory array,
+    and since the choice depends only on the hash, a query picks the same
+    frames in its copy of the audio. Votes on (file, frame offset) pairs
+    give candidates, which are then checked frame by frame.
+
+    The directory (fingerprints plus the <key>.json transcripts saved next
+    to them) is kept under max_bytes by evicting the least recently used
+    files; touch() marks a file as used.
+    """
+
+    def __init__(self, directory, samplerate=16000, max_bytes=TRANSCRIPT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.samplerate = samplerate
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._keys = []  # owner index -> key; None once evicted
+        self._fingerprints = {}
+        self._landmarks = None  # (hashes, owner index, frame), sorted by hash
+        self.evict()
+        for key in sorted(self._entries()):
+            if os.path.exists(os.path.join(directory, key + ".npy")):
+                self._load(key)
+
+    def __contains__(self, key):
+        return key in self._fingerprints
+
+    def _load(self, key):
+        self._fingerprints[key] = np.load(os.path.join(self.directory, key + ".npy"), mmap_mode="r")
+        self._keys.append(key)
+        if self._landmarks is not None:
+            self._landmarks = self._merge_landmarks(self._landmarks, len(self._keys) - 1)
+
+    def add(self, key, fp):
+        if key in self._fingerprints:
+            return
+        path = os.path.join(self.directory, key + ".npy")
+        np.save(path + ".tmp.npy", fp)
+        os.replace(path + ".tmp.npy", path)
+        self._load(key)
+        self.evict(keep=key)
+
+    def touch(self, key):
+        """Mark key's fingerprint and transcript as recently used."""
+        for suffix in ENTRY_SUFFIXES:
+            try:
+                os.utime(os.path.join(self.directory, key + suffix))
+            except OSError:
+                pass
+
+    def _entries(self):
+        """{key: (last used, total bytes)} of the files in the directory."""
+        entries = {}
+        for name in os.listdir(self.directory):
+            key, suffix = os.path.splitext(name)
+            if suffix not in ENTRY_SUFFIXES or key.endswith(".tmp"):
+                continue  # not ours, or a save in progress
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            used, size = entries.get(key, (0.0, 0))
+            entries[key] = (max(used, stat.st_mtime), size + stat.st_size)
+        return entries
+
+    def evict(self, keep=None):
+        """Delete least recently used files until the directory fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size in entries.values())
+        for key, (_, size) in sorted(entries.items(), key=lambda entry: entry[1][0]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._forget(key)
+            try:
+                for suffix in ENTRY_SUFFIXES:
+                    path = os.path.join(self.directory, key + suffix)
+                    if os.path.exists(path):
+                        os.remove(path)
+                total -= size
+                print(f"[INFO] Evicted cached transcript {key}")
+            except OSError as e:
+                print(f"[WARNING] Could not evict transcript {key}: {e}")
+
+    def _forget(self, key):
+        # The memmap must be released before its file can be deleted on Windows
+        if self._fingerprints.pop(key, None) is None:
+            return
+        owner = self._keys.index(key)
+        self._keys[owner] = None
+        if self._landmarks is not None:
+            hashes, owners, frames = self._landmarks
+            kept = owners != owner
+            self._landmarks = hashes[kept], owners[kept], frames[kept]
+
+    def _owner_landmarks(self, owner):
+        fp = np.asarray(self._fingerprints[self._keys[owner]])
+        picked = np.flatnonzero(((fp & 3) == 0) & (fp != 0))
+        return fp[picked], np.full(len(picked), owner, dtype=np.int32), picked.astype(np.int64)
+
+    def _merge_landmarks(self, landmarks, owner):
+        """landmarks with owner's added, by inserting them at their sorted positions."""
+        hashes, owners, frames = landmarks
+        new_hashes, new_owners, new_frames = self._owner_landmarks(owner)
+        order = np.argsort(new_hashes, kind="stable")
+        new_hashes, new_owners, new_frames = new_hashes[order], new_owners[order], new_frames[order]
+        at = np.searchsorted(hashes, new_hashes, side="right")
+        return np.insert(hashes, at, new_hashes), np.insert(owners, at, new_owners), np.insert(frames, at, new_frames)
+
+    def _build_landmarks(self):
+        parts = [self._owner_landmarks(owner) for owner, key in enumerate(self._keys) if key is not None]
+        if not parts:
+            return np.zeros(0, np.uint32), np.zeros(0, np.int32), np.zeros(0, np.int64)
+        hashes, owners, frames = (np.concatenate(column) for column in zip(*parts))
+        order = np.argsort(hashes, kind="stable")
+        return hashes[order], owners[order], frames[order]
+
+    def find(self, query, exclude=None, min_votes=20, max_candidates=8, min_seconds=10.0, shift=0.0):
+        """Stretches of query found in indexed files.
+
+        Returns [(key, offset_seconds, start, end)] sorted longest first, where
+        query time t in [start, end) corresponds to time t + offset_seconds
+        in the indexed file `key`. shift is how late in the audio the query's
+        first frame starts (see shifted_fingerprints()).
+        """
+        if self._landmarks is None:
+            self._landmarks = self._build_landmarks()
+        hashes, owners, frames = self._landmarks
+        picked = np.flatnonzero(((query & 3) == 0) & (query != 0))
+        if not len(picked) or not len(hashes):
+            return []
+        left = np.searchsorted(hashes, query[picked], side="left")
+        right = np.searchsorted(hashes, query[picked], side="right")
+        counts = right - left
+        keep = (counts > 0) & (counts <= MAX_POSTINGS)
+        picked, left, counts = picked[keep], left[keep], counts[keep]
+        if not len(picked):
+            return []
+
+        # Expand every (query frame, posting) pair and vote on its offset
+        total = int(counts.sum())
+        starts = np.repeat(left - np.cumsum(counts) + counts, counts)
+        positions = starts + np.arange(total)
+        offsets = frames[positions] - np.repeat(picked, counts)
+        votes = owners[positions].astype(np.int64) << 32 | (offsets + (1 << 31))
+        candidates, tally = np.unique(votes, return_counts=True)
+        best = np.argsort(tally)[::-1][:max_candidates]
+
+        min_frames = int(min_seconds * self.samplerate / HOP)
+        found = []
+        for candidate in candidates[best[tally[best] >= min_votes]]:
+            key = self._keys[int(candidate >> 32)]
+            if key == exclude:
+                continue
+            offset = int(candidate & 0xFFFFFFFF) - (1 << 31)
+            for a, b in matching_runs(query, self._fingerprints[key], offset, min_frames=min_frames):
+                found.append((
+                    key, float(frames_to_seconds(offset, self.samplerate)) - shift,
+                    float(frames_to_seconds(a, self.samplerate)) + shift,
+                    float(frames_to_seconds(b, self.samplerate)) + shift,
+                ))
+        found.sort(key=lambda match: match[3] - match[2], reverse=True)
+        return found
+
+    def find_shifted(self, queries, exclude=None, min_seconds=10.0):
+        """find() over shifted_fingerprints(); one match per file and offset, longest first."""
+        best = {}
+        tolerance = HOP / self.samplerate
+        for shift, query in queries:
+            for match in self.find(query, exclude=exclude, min_seconds=min_seconds, shift=shift):
+                key, offset, start, end = match
+                # Neighbouring shifts find the same copy at offsets under a hop apart
+                slot = (key, round(offset / tolerance))
+                for near in (slot, (key, slot[1] - 1), (key, slot[1] + 1)):
+                    if near in best:
+                        slot = near
+                        break
+                if slot not in best or end - start > best[slot][3] - best[slot][2]:
+                    best[slot] = match
+        return sorted(best.values(), key=lambda match: match[3] - match[2], reverse=True)
@@ -0,0 +1,138 @@
+"""
+Benchmark: translation tail latency with and without hedging
+
+Starts two local DeepL-compatible stand-in servers (no API key or network
+needed): a fast primary that occasionally stalls and a slower but steadier
+secondary. The same request mix is sent primary-only and through
+HedgedTranslator, and the latency percentiles are compared. A second run
+stalls every primary call for --outage-seconds (a DeepL outage) and counts
+how many lines TRANSLATION_WORKERS callers still get through the hedge.
+
+Usage:
+    python benchmarks/bench_hedged_translation.py [--requests 400] [--stall-rate 0.05] [--outage-seconds 20]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import TRANSLATION_TIMEOUT, TRANSLATION_MAX_RETRIES, TRANSLATION_WORKERS
+from translate.hedging import Backend, HedgedTranslator, TranslationError
+from benchmarks.standin_deepl import make_standin, start_server
+
+
+def standin_backend(url, timeout=10.0):
+    session = requests.Session()
+
+    def translate(jp_text):
+        try:
+            response = session.post(url, data={"text": jp_text, "source_lang": "JA", "target_lang": "EN"}, timeout=timeout)
+            response.raise_for_status()
+            return response.json()["translations"][0]["text"]
+        except requests.RequestException:
+            raise TranslationError("[Translation Failed]")
+
+    return translate
+
+
+def measure(translate, count, concurrency):
+    latencies = []
+    lock = threading.Lock()
+
+    def one(i):
+        started = time.perf_counter()
+        translate(f"テスト文 {i}")
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(count)))
+    return sorted(latencies)
+
+
+def measure_for(translate, seconds, concurrency):
+    """Latencies of calls completed by concurrency callers within seconds."""
+    latencies = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def caller(worker):
+        i = 0
+        while time.perf_counter() < stop_at:
+            started = time.perf_counter()
+            translate(f"テスト文 {worker}-{i}")
+            finished = time.perf_counter()
+            if finished <= stop_at:
+                with lock:
+                    latencies.append(finished - started)
+            i += 1
+
+    threads = [threading.Thread(target=caller, args=(w,), daemon=True) for w in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies)
+
+
+def summary(name, latencies):
+    def pct(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"{name:>14} {pct(0.50):>8.0f} {pct(0.95):>8.0f} {pct(0.99):>8.0f} {latencies[-1] * 1000:>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--stall-rate", type=float, default=0.05, help="fraction of primary calls that stall")
+    parser.add_argument("--stall-seconds", type=float, default=3.0)
+    parser.add_argument("--outage-seconds", type=float, default=20.0, help="primary stall in the outage run (0 skips it)")
+    parser.add_argument("--outage-window", type=float, default=15.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    primary_server, primary_url = start_server(make_standin(0.15, args.stall_rate, args.stall_seconds))
+    secondary_server, secondary_url = start_server(make_standin(0.30, args.stall_rate / 4, args.stall_seconds))
+
+    primary_only = Backend("primary", standin_backend(primary_url))
+    hedged = HedgedTranslator(
+        Backend("primary", standin_backend(primary_url)),
+        Backend("secondary", standin_backend(secondary_url)),
+    )
+
+    print(f"[BENCH] {args.requests} requests x {args.concurrency} clients, primary stall rate {args.stall_rate:.0%}")
+    print(f"{'mode':>14} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    summary("primary only", measure(primary_only, args.requests, args.concurrency))
+    summary("hedged", measure(hedged.translate, args.requests, args.concurrency))
+    print(f"[BENCH] hedges sent {hedged.hedges_sent}, won {hedged.hedges_won}")
+
+    if args.outage_seconds:
+        # Every primary call stalls past the production timeout
+        outage_server, outage_url = start_server(make_standin(0.15, 1.0, args.outage_seconds))
+        outage = HedgedTranslator(
+            Backend("primary", standin_backend(outage_url, timeout=args.outage_seconds + 5)),
+            Backend("secondary", standin_backend(secondary_url)),
+            timeout=TRANSLATION_TIMEOUT * (TRANSLATION_MAX_RETRIES + 1),
+        )
+        print(f"[BENCH] primary outage ({args.outage_seconds:g}s stalls), {TRANSLATION_WORKERS} clients "
+              f"for {args.outage_window:g}s")
+        latencies = measure_for(outage.translate, args.outage_window, TRANSLATION_WORKERS)
+        summary("outage", latencies)
+        print(f"[BENCH] {len(latencies)} lines translated, primary circuit {outage.primary.breaker.state}")
+        outage_server.shutdown()
+
+    primary_server.shutdown()
+    secondary_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
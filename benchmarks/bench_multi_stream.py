@@ -0,0 +1,78 @@
+"""
+Benchmark: how many concurrent realtime streams one machine sustains
+
+Every stream gets its own recognizer on the one shared Vosk model (as in
+multi-stream mode) and decodes the same audio as fast as it can. A stream
+count is sustainable when even the slowest stream decodes faster than
+realtime by the given headroom.
+
+Usage:
+    python benchmarks/bench_multi_stream.py <audio file> [--seconds 60] [--max-streams 8]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import ASR_MODEL_PATH, CHUNK_DURATION, SAMPLERATE
+from audio.audio_file_capture import AudioFileCapture
+from asr.jp_asr import JapaneseASR, load_model
+
+
+def decode_stream(audio_file, model_path, seconds, results, index, start_barrier):
+    capture = AudioFileCapture(audio_file, chunk_duration=CHUNK_DURATION, samplerate=SAMPLERATE)
+    asr = JapaneseASR(model_path=model_path)
+    start_barrier.wait()
+    started = time.perf_counter()
+    while capture.tell() < seconds:
+        chunk = capture.get_chunk()
+        if chunk is None:
+            break
+        asr.recognize(chunk)
+    asr.flush()
+    results[index] = capture.tell() / (time.perf_counter() - started)
+
+
+def run(audio_file, model_path, streams, seconds):
+    """Decode `streams` copies concurrently; returns each stream's realtime factor."""
+    results = [0.0] * streams
+    barrier = threading.Barrier(streams)
+    threads = [
+        threading.Thread(target=decode_stream, args=(audio_file, model_path, seconds, results, i, barrier))
+        for i in range(streams)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio_file")
+    parser.add_argument("--model", default=ASR_MODEL_PATH)
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio seconds decoded per stream")
+    parser.add_argument("--max-streams", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--headroom", type=float, default=1.2, help="required realtime factor of the slowest stream")
+    args = parser.parse_args()
+
+    load_model(args.model)
+    print(f"[BENCH] {os.cpu_count()} CPUs, {args.seconds:.0f}s of audio per stream")
+    print(f"{'streams':>8} {'slowest x':>10} {'mean x':>8} {'total x':>8}")
+    sustained = 0
+    for streams in range(1, args.max_streams + 1):
+        factors = run(args.audio_file, args.model, streams, args.seconds)
+        slowest = min(factors)
+        print(f"{streams:>8} {slowest:>10.2f} {sum(factors) / streams:>8.2f} {sum(factors):>8.2f}")
+        if slowest < args.headroom:
+            break
+        sustained = streams
+    print(f"[BENCH] Sustains {sustained} concurrent realtime stream(s) at {args.headroom:.1f}x headroom")
+
+
+if __name__ == "__main__":
+    main()
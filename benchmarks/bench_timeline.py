@@ -0,0 +1,77 @@
+"""
+Benchmark: transcript timeline lookups on a long session
+
+Fills a SegmentStore with synthetic JP/EN lines (default 50k, about a
+4-hour VOD several times over) and times searches and time lookups.
+
+Usage:
+    python benchmarks/bench_timeline.py [--lines 50000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pipeline.segments import SegmentStore
+
+JP_WORDS = ["今日", "は", "コンサート", "の", "話", "ゲーム", "みんな", "ありがとう", "配信", "歌", "えっと",
+            "すごい", "楽しい", "明日", "また", "ね", "です", "ライブ", "スパチャ", "かわいい", "新しい", "衣装"]
+EN_WORDS = ["today", "the", "concert", "talk", "game", "everyone", "thanks", "stream", "song", "um",
+            "amazing", "fun", "tomorrow", "again", "live", "superchat", "cute", "new", "outfit", "is"]
+QUERIES = ["コンサート", "ライブ 衣装", "ありがとう", "concert", "new outfit", "superchat", "歌", "the", "明日 配信",
+           "the concert is new", "すごい楽しい明日", "今日はコンサート"]
+
+
+def build(lines, seed):
+    rng = random.Random(seed)
+    store = SegmentStore()
+    t = 0.0
+    for _ in range(lines):
+        duration = rng.uniform(1.0, 4.0)
+        segment = store.add(t, t + duration, " ".join(rng.choices(JP_WORDS, k=rng.randint(2, 8))))
+        store.set_translation(segment, " ".join(rng.choices(EN_WORDS, k=rng.randint(2, 10))))
+        t += duration + rng.uniform(0.0, 2.0)
+    return store, t
+
+
+def timed(fn, args_list):
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return samples
+
+
+def summary(name, samples):
+    def pct(q):
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+    print(f"{name:>22} {sum(samples) / len(samples):>9.1f} {pct(0.5):>9.1f} {pct(0.99):>9.1f} {samples[-1]:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=100, help="max hits returned per search (as in the panel)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store, duration = build(args.lines, args.seed)
+    print(f"[BENCH] {len(store)} lines over {duration / 3600:.1f}h built in {time.perf_counter() - started:.2f}s")
+
+    rng = random.Random(args.seed)
+    print(f"{'lookup':>22} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'max us':>9}")
+    summary("segment_at", timed(store.segment_at, [(rng.uniform(0, duration), 2.0) for _ in range(args.queries)]))
+    for query in QUERIES:
+        hits = len(store.search(query, args.limit))
+        summary(f"{query} ({hits})", timed(store.search, [(query, args.limit)] * (args.queries // 10)))
+
+
+if __name__ == "__main__":
+    main()
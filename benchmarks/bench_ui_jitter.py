@@ -0,0 +1,92 @@
+"""
+Benchmark: Qt frame jitter while ASR decodes in-process vs in a worker process
+
+An offscreen Qt event loop ticks a 16 ms precise timer (one display frame)
+while a background thread feeds audio to the recognizer as fast as it can,
+once with JapaneseASR in the same process and once with ProcessASR. Late
+ticks are what shows up as subtitle/UI stutter.
+
+Usage:
+    python benchmarks/bench_ui_jitter.py <audio file> [--seconds 20]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QApplication
+
+from config import ASR_MODEL_PATH, ASR_RING_SECONDS, CHUNK_DURATION, SAMPLERATE
+from audio.audio_file_capture import AudioFileCapture
+from asr.jp_asr import JapaneseASR
+from asr.asr_worker import ProcessASR
+
+FRAME_MS = 16
+
+
+def measure(app, asr, audio_file, seconds):
+    """Return the observed timer intervals (ms) while `asr` decodes in a thread."""
+    stop = threading.Event()
+
+    def decode():
+        capture = AudioFileCapture(audio_file, chunk_duration=CHUNK_DURATION, samplerate=SAMPLERATE)
+        while not stop.is_set():
+            chunk = capture.get_chunk()
+            if chunk is None:
+                capture.seek(0)
+                continue
+            asr.recognize(chunk)
+
+    intervals = []
+    last = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        intervals.append((now - last[0]) * 1000)
+        last[0] = now
+
+    timer = QTimer()
+    timer.setTimerType(Qt.PreciseTimer)
+    timer.timeout.connect(tick)
+    decoder = threading.Thread(target=decode, daemon=True)
+    decoder.start()
+    timer.start(FRAME_MS)
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec_()
+    timer.stop()
+    stop.set()
+    decoder.join()
+    return sorted(intervals[1:])
+
+
+def summary(name, intervals):
+    def pct(q):
+        return intervals[min(len(intervals) - 1, int(q * len(intervals)))]
+    late = sum(1 for i in intervals if i > 2 * FRAME_MS)
+    print(f"{name:>12} {sum(intervals) / len(intervals):>8.1f} {pct(0.95):>8.1f} {pct(0.99):>8.1f} "
+          f"{intervals[-1]:>8.1f} {late:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio_file")
+    parser.add_argument("--model", default=ASR_MODEL_PATH)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    print(f"[BENCH] {FRAME_MS} ms frame timer for {args.seconds:.0f}s per mode")
+    print(f"{'mode':>12} {'mean ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'late':>6}")
+    summary("in-process", measure(app, JapaneseASR(model_path=args.model), args.audio_file, args.seconds))
+    worker = ProcessASR(args.model, ring_seconds=ASR_RING_SECONDS, samplerate=SAMPLERATE)
+    summary("worker", measure(app, worker, args.audio_file, args.seconds))
+    worker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Soak test: a long session in fast-forward, watching for slow growth
+
+Runs the real player pipeline (segment store, deadline scheduler, load
+shedder, translator cache, audio cache) against hours of audio with the
+playhead advanced at --speed times realtime. DeepL and its hedged Google
+fallback are replaced by two local stand-in servers and, unless --asr vosk is given, the recognizer by a
+scripted one that emits a line every --line-every seconds of audio, so an
+8 hour stream finishes in minutes.
+
+Once a second it samples anonymous RSS, thread count, translation queue
+depth, transcript size, translation cache size, ASR lag and the wall-clock
+latency from a line being recognized to its translation arriving. Growth
+is measured from the end of the warmup to the end of the run; the script
+exits 1 if any budget is exceeded.
+
+Usage:
+    python benchmarks/soak.py [--hours 8] [--speed 120] [--audio <file to tile>] [--asr scripted|vosk]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from config import SAMPLERATE
+from audio.audio_cache import AudioCache, media_hash
+from benchmarks.bench_hedged_translation import standin_backend
+from benchmarks.standin_deepl import make_standin, start_server
+from pipeline.hub import StreamHub
+import translate.jp_to_en as jp_to_en
+
+PHRASES = [
+    "こんにちは", "ありがとう", "すごい", "やばい", "これは", "なるほど", "今日は",
+    "ゲーム", "みんな", "配信", "楽しい", "ちょっと待って", "そうだね", "いくよ",
+]
+
+
+class ScriptedASR:
+    """Recognizer stand-in: one line every `line_every` seconds of audio.
+
+    `rtf` sleeps that fraction of each chunk's duration to mimic decode cost.
+    Lines mix a few phrases with a counter, so some repeat (cache hits) and
+    most don't (cache growth), roughly like a real stream.
+    """
+
+    def __init__(self, line_every, rtf, repeat_rate=0.3):
+        self.line_every = line_every
+        self.rtf = rtf
+        self.repeat_rate = repeat_rate
+        self._count = 0
+        self.reset()
+
+    def reset(self):
+        self._heard = 0.0
+        self._next = self.line_every
+
+    def recognize_timed(self, audio_chunk):
+        seconds = len(audio_chunk) / SAMPLERATE
+        if self.rtf:
+            time.sleep(seconds * self.rtf)
+        self._heard += seconds
+        if self._heard < self._next:
+            return "", None, None
+        start = self._next - self.line_every
+        self._next += self.line_every
+        return self._line(), start, min(self._heard, start + self.line_every * 0.8)
+
+    def partial(self):
+        return ""
+
+    def flush(self):
+        return "", None, None
+
+    def _line(self):
+        self._count += 1
+        words = random.sample(PHRASES, 2)
+        if random.random() < self.repeat_rate:
+            return "".join(words)
+        return "".join(words) + str(self._count)
+
+
+def read_proc_status():
+    """Anonymous RSS in MB and OS thread count for this process."""
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            fields[key] = value.split()
+    rss_kb = int((fields.get("RssAnon") or fields["VmRSS"])[0])
+    return rss_kb / 1024.0, int(fields["Threads"][0])
+
+
+def prepare_audio(cache, hours, audio):
+    """A cached PCM entry `hours` long; returns the media path that maps to it.
+
+    Without --audio it is a sparse file of silence, so an 8 hour run costs
+    no disk. With --audio that file is decoded once and tiled.
+    """
+    workdir = tempfile.mkdtemp(prefix="holoyomi-soak-")
+    media_path = os.path.join(workdir, "soak.media")
+    with open(media_path, "wb") as f:
+        f.write(os.urandom(4096))
+    pcm_path = cache.path_for(media_hash(media_path))
+    total = int(hours * 3600 * SAMPLERATE) * 2
+    with open(pcm_path, "wb") as out:
+        if audio:
+            with open(cache.get(audio), "rb") as f:
+                tile = f.read()
+            written = 0
+            while written < total:
+                written += out.write(tile[:total - written])
+        else:
+            out.truncate(total)
+    return media_path, workdir
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=8.0, help="media length to play through")
+    parser.add_argument("--speed", type=float, default=120.0, help="playhead speed, x realtime")
+    parser.add_argument("--audio", help="audio/video file to tile instead of silence")
+    parser.add_argument("--asr", choices=("scripted", "vosk"), default="scripted")
+    parser.add_argument("--line-every", type=float, default=4.0, help="scripted ASR: audio seconds per line")
+    parser.add_argument("--rtf", type=float, default=0.0, help="scripted ASR: decode seconds per audio second")
+    parser.add_argument("--deepl-median", type=float, default=0.05)
+    parser.add_argument("--deepl-stall-rate", type=float, default=0.01)
+    parser.add_argument("--warmup", type=float, default=0.1, help="fraction of the run excluded from growth")
+    parser.add_argument("--report-every", type=float, default=30.0, help="wall seconds between table rows")
+    parser.add_argument("--rss-budget-mb", type=float, default=150.0)
+    parser.add_argument("--thread-budget", type=int, default=4)
+    parser.add_argument("--queue-budget", type=int, default=500)
+    parser.add_argument("--latency-budget", type=float, default=5.0, help="p95 translation latency, wall seconds")
+    args = parser.parse_args()
+    if args.asr == "vosk" and not args.audio:
+        parser.error("--asr vosk needs --audio (it recognizes nothing in silence)")
+
+    # Local DeepL stand-in, without the real API's rate and quota limits, and
+    # a slower but steadier one for Google so hedges run as in the player
+    server, url = start_server(make_standin(args.deepl_median, args.deepl_stall_rate, 2.0))
+    secondary_server, secondary_url = start_server(
+        make_standin(args.deepl_median * 2, args.deepl_stall_rate / 4, 2.0)
+    )
+    jp_to_en.DEEPL_URL = url
+    jp_to_en.DEEPL_API_KEY = "soak"
+    jp_to_en._hedged_translator.secondary.translate_fn = standin_backend(secondary_url)
+    jp_to_en._usage_synced.set()
+    jp_to_en._quota.limit = 1 << 40
+    jp_to_en._request_bucket.rate = jp_to_en._request_bucket.capacity = 10000
+
+    app = QApplication(sys.argv)
+    from holoyomi_app import VideoPlayerScreen
+
+    # Scripted lines must not end up in the user's transcript cache, where
+    # the real file would later match them
+    transcript_dir = tempfile.mkdtemp(prefix="holoyomi-soak-transcripts-")
+    hub = StreamHub(transcript_dir=transcript_dir)
+    hub.audio_cache = AudioCache(tempfile.mkdtemp(prefix="holoyomi-soak-cache-"), max_bytes=1 << 62)
+    if args.asr == "scripted":
+        hub.create_asr = lambda role="asr": ScriptedASR(args.line_every, args.rtf)
+    else:
+        hub.preload()
+    media_path, workdir = prepare_audio(hub.audio_cache, args.hours, args.audio)
+
+    screen = VideoPlayerScreen(hub)
+    duration_ms = int(args.hours * 3600 * 1000)
+    screen.player_signals.length_changed.emit(duration_ms)
+
+    # Recognized -> translated latency, measured by a segment store listener
+    recognized_at = {}
+    latencies = []
+
+    def measure(kind, segment):
+        if kind == "segment":
+            recognized_at[segment.id] = time.perf_counter()
+            return
+        started = recognized_at.pop(segment.id, None)
+        if started is not None:
+            latencies.append(time.perf_counter() - started)
+
+    hub.segment_store(media_path).subscribe(measure)
+    session = screen.session = hub.open_session(media_path, screen.playhead, name="soak")
+    screen.segments = session.store
+    screen.segments.subscribe(screen._on_segment_event)
+
+    started = time.perf_counter()
+    samples = []
+    wall_seconds = args.hours * 3600 / args.speed
+    print(f"Soak: {args.hours:g} h of media at {args.speed:g}x (~{wall_seconds / 60:.1f} min wall)")
+    header = f"{'wall':>7} {'media':>9} {'rss MB':>8} {'threads':>7} {'queue':>6} {'lines':>7} " \
+             f"{'cache':>6} {'lag s':>6} {'p95 lat':>8}"
+    print(header)
+    print("-" * len(header))
+
+    def advance():
+        position = min(duration_ms, int((time.perf_counter() - started) * args.speed * 1000))
+        screen.player_signals.time_changed.emit(position)
+        if position >= duration_ms:
+            app.quit()
+
+    def sample():
+        rss, threads = read_proc_status()
+        window, latencies[:] = latencies[:], []
+        row = {
+            "wall": time.perf_counter() - started,
+            "media": screen.playhead(),
+            "rss": rss,
+            "threads": threads,
+            "queue": hub.translation_scheduler.pending(),
+            "lines": len(screen.segments),
+            "cache": hub.translator.get_cache_size(),
+            "lag": session.load_shedder.lag,
+            "p95": percentile(window, 0.95),
+        }
+        samples.append(row)
+        if len(samples) == 1 or row["wall"] - last_report[0] >= args.report_every:
+            last_report[0] = row["wall"]
+            print(f"{row['wall']:>6.0f}s {row['media'] / 3600:>8.2f}h {rss:>8.1f} {threads:>7} "
+                  f"{row['queue']:>6} {row['lines']:>7} {row['cache']:>6} {row['lag']:>6.1f} {row['p95']:>7.2f}s")
+
+    last_report = [0.0]
+    tick = QTimer()
+    tick.timeout.connect(advance)
+    tick.start(50)
+    sampler = QTimer()
+    sampler.timeout.connect(sample)
+    sampler.start(1000)
+    app.exec_()
+    sample()
+
+    # Growth from the end of warmup to the end of the run
+    baseline = samples[min(len(samples) - 1, int(len(samples) * args.warmup))]
+    after = samples[samples.index(baseline):]
+    results = [
+        ("RSS growth (MB)", max(s["rss"] for s in after) - baseline["rss"], args.rss_budget_mb),
+        ("thread growth", max(s["threads"] for s in after) - baseline["threads"], args.thread_budget),
+        ("max translation queue", max(s["queue"] for s in after), args.queue_budget),
+        ("worst p95 latency (s)", max(s["p95"] for s in after), args.latency_budget),
+    ]
+    print()
+    print(f"Lines: {samples[-1]['lines']}, translation cache: {samples[-1]['cache']}, "
+          f"expired translations: {hub.translation_scheduler.expired}, "
+          f"hedges sent/won: {jp_to_en._hedged_translator.hedges_sent}/{jp_to_en._hedged_translator.hedges_won}")
+    print(session.load_shedder.report())
+    failed = False
+    for name, value, budget in results:
+        ok = value <= budget
+        failed |= not ok
+        print(f"{name:<24} {value:>10.2f}  budget {budget:>8.2f}  {'ok' if ok else 'OVER BUDGET'}")
+
+    session.stop()
+    server.shutdown()
+    secondary_server.shutdown()
+    hub.shutdown()
+    os.remove(hub.audio_cache.path_for(media_hash(media_path)))
+    os.remove(media_path)
+    os.rmdir(workdir)
+    shutil.rmtree(transcript_dir, ignore_errors=True)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
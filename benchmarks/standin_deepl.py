@@ -0,0 +1,39 @@
+"""
+Local DeepL-compatible stand-in server for benchmarks and soak runs
+"""
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+def make_standin(median, stall_rate, stall_seconds):
+    """HTTP handler answering /v2/translate after a lognormal delay with occasional stalls."""
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            form = parse_qs(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode())
+            delay = random.lognormvariate(0, 0.35) * median
+            if random.random() < stall_rate:
+                delay += stall_seconds
+            time.sleep(delay)
+            body = json.dumps({"translations": [{"text": "EN: " + form.get("text", [""])[0]}]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StandInHandler
+
+
+def start_server(handler):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v2/translate"
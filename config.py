@@ -1,4 +1,3 @@
-<<<<<<< HEAD
 """
 Holoyomi Configuration
 """
@@ -6,13 +5,23 @@ import os
 
 ## AUDIO SETTINGS
 AUDIO_FILE = r"e:\ホロライブ\holocon_events\sample.mp4"
-CHUNK_DURATION = 1.0
+CHUNK_DURATION = 1.0  # starting chunk size; adapted at runtime within the preset bounds
+# Chunk-size presets (seconds): "latency" favours fast subtitles, "cpu" favours
+# fewer recognizer calls. Pick one with HOLOYOMI_CHUNK_PRESET or --chunk-preset.
+CHUNK_PRESETS = {
+    "latency": {"min": 0.2, "max": 0.8, "target_latency": 0.6},
+    "balanced": {"min": 0.4, "max": 1.5, "target_latency": 1.2},
+    "cpu": {"min": 1.0, "max": 3.0, "target_latency": 3.0},
+}
+CHUNK_PRESET = os.environ.get("HOLOYOMI_CHUNK_PRESET", "balanced")
 SAMPLERATE = 16000
 
 ## ASR SETTINGS
 ASR_MODEL_PATH = r"E:/Holoyomi Project/Phase 1 Prototype/vosk-model-small-ja-0.22"
 if not os.path.exists(ASR_MODEL_PATH):
     print(f"[WARNING] ASR model not found at: {ASR_MODEL_PATH}")
+USE_ASR_PROCESS = False  # decode in a worker process (one per stream, each loads its own model)
+ASR_RING_SECONDS = 10.0  # shared-memory audio ring size per worker
 
 ## TRANSLATION SETTINGS
 USE_TRANSLATION = True
@@ -27,6 +36,8 @@ DEFAULT_SUBTITLE_MARGIN = 0.05
 DEFAULT_VOLUME = 80
 DEFAULT_WINDOW_WIDTH = 960
 DEFAULT_WINDOW_HEIGHT = 600
+SUBTITLE_HOLD_SECONDS = 2.0  # keep a line on screen this long after its speech ends
+SEARCH_MAX_HITS = 100        # transcript search results listed at once
 
 ## DEBUG SETTINGS
 DEBUG_MODE = True
@@ -36,8 +47,59 @@ SHOW_TRANSLATION_OUTPUT = True
 ## ADVANCED SETTINGS
 TRANSLATION_MAX_RETRIES = 2
 TRANSLATION_TIMEOUT = 10
+TRANSLATION_BACKOFF_BASE = 0.5  # s; exponential backoff with full jitter
+TRANSLATION_BACKOFF_CAP = 8.0
+DEEPL_CHAR_QUOTA = 500000       # characters per billing period (Free plan)
+DEEPL_REQUESTS_PER_SECOND = 5.0
+DEEPL_BURST = 10
+DEEPL_MAX_CONCURRENCY = 8       # upper bound for the adaptive (AIMD) limit
+DEEPL_TARGET_LATENCY = 1.0      # s; slower responses stop the limit from growing
+USE_TRANSLATION_HEDGING = True  # race the Google fallback against slow DeepL calls
+HEDGE_MIN_DELAY = 0.3           # s; never hedge earlier than this ...
+HEDGE_DEFAULT_DELAY = 1.5       # ... and use this until DeepL's p95 is known
+CIRCUIT_FAILURE_THRESHOLD = 5   # consecutive failures before a backend is skipped
+CIRCUIT_RESET_SECONDS = 30.0
 USE_TRANSLATION_CACHE = True
-TEMP_AUDIO_SUFFIX = "_holoyomi_temp.wav"
+TRANSLATION_CACHE_MAX_ENTRIES = 20000  # least recently used lines are dropped past this
+TRANSLATION_EXPIRE_SECONDS = 120.0     # drop queued translations this far behind the playhead
+AUDIO_CACHE_DIR = os.environ.get(
+    "HOLOYOMI_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "holoyomi", "audio")
+)
+AUDIO_CACHE_MAX_BYTES = 4 * 1024 ** 3  # ~35 hours of 16 kHz mono PCM
+USE_TRANSCRIPT_REUSE = True  # fingerprint audio and reuse lines from re-uploads/clips
+TRANSCRIPT_CACHE_DIR = os.path.join(os.path.dirname(AUDIO_CACHE_DIR), "transcripts")
+TRANSCRIPT_CACHE_MAX_BYTES = 512 * 1024 ** 2  # fingerprints + transcripts, roughly 1 MB per hour of audio
+FINGERPRINT_MIN_MATCH_SECONDS = 10.0  # shorter matching stretches are recognized again
+
+## SCHEDULING SETTINGS
+LOOKAHEAD_SECONDS = 60.0    # how far ahead of the playhead ASR/translation run
+TRANSLATION_WORKERS = DEEPL_MAX_CONCURRENCY  # the adaptive limiter decides how many are in flight
+ASR_DECODE_SLOTS = os.cpu_count() or 1  # recognizers decoding at once across all streams
+PRELOAD_ITEMS = 2           # upcoming playlist items prepared in the background
+PRELOAD_SECONDS = 300.0     # how much of each one is transcribed/translated ahead
+
+## RESOURCE SETTINGS
+PLAYBACK_RESERVED_CORES = 1   # cores kept free of ASR/ffmpeg for VLC decoding
+ASR_NICE = 5                  # niceness of threads/processes decoding the playing video
+BACKGROUND_NICE = 15          # ... and of preprocessing, fingerprinting and upcoming extractions
+LOST_PICTURE_RATIO = 0.02     # VLC lost/shown pictures above this throttles background work
+THROTTLE_RELEASE_SECONDS = 10.0  # smooth playback needed before background work resumes
+THROTTLED_LOOKAHEAD_SECONDS = 10.0  # how far ahead the player's own ASR runs while throttled
+
+## SERVICE SETTINGS
+USE_SERVICE = True  # attach to a running `python -m service.daemon` instead of loading everything
+SERVICE_SOCKET = os.environ.get(
+    "HOLOYOMI_SOCKET", os.path.join(os.path.dirname(AUDIO_CACHE_DIR), "holoyomi.sock")
+)
+SERVICE_ASR_POOL = 2        # idle recognizers the service keeps loaded for new clients
+SERVICE_CONNECT_TIMEOUT = 2.0  # seconds to wait for the service's hello before running locally
+
+## LOAD SHEDDING SETTINGS
+LOAD_SHED_THRESHOLDS = (1.0, 2.0, 4.0, 8.0)  # lag (s) to enter levels 1-4
+LOAD_SHED_EXIT_RATIO = 0.5  # step down once lag < ratio * threshold ...
+LOAD_SHED_MIN_DWELL = 3.0   # ... and the level has been held this long (s)
+FILLER_MAX_CHARS = 3        # lines this short count as fillers
+STALE_AUDIO_SECONDS = 2.0   # live audio older than this is dropped at level 3
 
 ## VALIDATION
 def validate_config():
@@ -49,6 +111,8 @@ def validate_config():
         issues.append(f"ASR model not found: {ASR_MODEL_PATH}")
     if CHUNK_DURATION <= 0:
         issues.append("CHUNK_DURATION must be positive")
+    if CHUNK_PRESET not in CHUNK_PRESETS:
+        issues.append(f"CHUNK_PRESET must be one of {', '.join(CHUNK_PRESETS)}")
     if SAMPLERATE != 16000:
         issues.append("SAMPLERATE should be 16000 for Vosk")
     if issues:
@@ -61,6 +125,3 @@ def validate_config():
 if __name__ != "__main__":
     if DEBUG_MODE:
         validate_config()
-=======
-# Configuration settings
->>>>>>> 4c3e32737f364236d02eb6f18f7d604f08a93f41
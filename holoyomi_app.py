@@ -4,59 +4,134 @@ Fixed version with proper subtitle pipeline integration
 """
 import sys
 import os
-import threading
-import ffmpeg
+import math
+import time
+import argparse
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton, QLabel, QFileDialog, 
-    QVBoxLayout, QHBoxLayout, QSlider, QSizePolicy, QMessageBox, QDialog, QCheckBox
+    QVBoxLayout, QHBoxLayout, QGridLayout, QSlider, QSizePolicy, QMessageBox, QDialog, QCheckBox,
+    QDockWidget, QLineEdit, QListWidget, QListWidgetItem, QShortcut
 )
-from PyQt5.QtGui import QLinearGradient, QBrush, QColor, QPainter, QFont
+from PyQt5.QtGui import QLinearGradient, QBrush, QColor, QPainter, QFont, QFontMetrics, QPainterPath, QPen, QKeySequence
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QObject
 from PyQt5.QtWidgets import QStyle
 import vlc
 import random
+from collections import OrderedDict
 
 # Import your modules
-from config import AUDIO_FILE, CHUNK_DURATION, SAMPLERATE, ASR_MODEL_PATH, USE_TRANSLATION
-from audio.audio_file_capture import AudioFileCapture
-from asr.jp_asr import JapaneseASR
-if USE_TRANSLATION:
-    from translate.jp_to_en import JPToENTranslator
-else:
-    JPToENTranslator = None
+from config import (
+    SUBTITLE_HOLD_SECONDS, CHUNK_PRESET, CHUNK_PRESETS, PRELOAD_ITEMS, SEARCH_MAX_HITS,
+)
+# The pipeline itself (Vosk, ffmpeg, translators) is imported only when this
+# process runs it, so attaching to the resident service starts fast
+from pipeline.segments import SegmentStore
+
+
+def create_hub(chunk_preset=CHUNK_PRESET):
+    """The resident service when it is running, else an in-process StreamHub"""
+    started = time.perf_counter()
+    from service.client import connect
+    client = connect(chunk_preset=chunk_preset)
+    if client is not None:
+        print(f"[INFO] Attached to the Holoyomi service in {(time.perf_counter() - started) * 1000:.0f} ms "
+              f"(its chunk preset applies)")
+        return client
+    from pipeline.hub import StreamHub
+    hub = StreamHub(chunk_preset=chunk_preset)
+    print(f"[INFO] No Holoyomi service running; pipeline loaded in-process in "
+          f"{time.perf_counter() - started:.1f}s")
+    return hub
 
 
 class SubtitleSignals(QObject):
     """Signals for thread-safe subtitle updates"""
-    update_text = pyqtSignal(str, str)  # jp_text, en_text
+    segments_changed = pyqtSignal()  # a segment was recognized or translated
+
+
+class PlayerSignals(QObject):
+    """Signals carrying VLC event-manager callbacks into the Qt thread"""
+    time_changed = pyqtSignal(int)    # ms
+    length_changed = pyqtSignal(int)  # ms
+    state_changed = pyqtSignal(str)   # "playing", "paused", "stopped", "ended"
+
 
+def format_timestamp(ms):
+    """Format milliseconds as MM:SS for the time marker."""
+    m, s = divmod(max(0, int(ms / 1000)), 60)
+    return f"{m:02}:{s:02}"
+
+
+class SubtitleOverlay(QWidget):
+    """Subtitle text painted directly as an outlined path.
+
+    The glyph layout for the current text/font/width is built once as a
+    QPainterPath and kept in a small LRU cache, so opacity changes and
+    repaints only re-fill the cached path instead of re-polishing a stylesheet.
+    """
+    OUTLINE_WIDTH = 4
+    PADDING = 8
+    LAYOUT_CACHE_SIZE = 32
 
-class SubtitleOverlay(QLabel):
     def __init__(self, video_widget):
         super().__init__(video_widget)
-        self.setText("")
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        self._text = ""
         self.bg_opacity = 0.0
         self.font_size = 26
         self.text_opacity = 1.0
-        self.setStyleSheet(self._make_style(font_size=self.font_size, bg_opacity=self.bg_opacity, text_opacity=self.text_opacity))
-        self.setAlignment(Qt.AlignHCenter | Qt.AlignBottom)
+        self._text_font = QFont("Segoe UI")
+        self._text_font.setStyleHint(QFont.SansSerif)
+        self._text_font.setPixelSize(self.font_size)
+        self._outline_pen = QPen(QColor(0, 0, 0), self.OUTLINE_WIDTH, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+        self._text_brush = QBrush(QColor(255, 255, 255))
+        self._layout_cache = OrderedDict()
         self.setVisible(True)
         self.margin = 0.05
         self._settings_dialog = None
         self._visible = True
         self.installEventFilter(self)
 
-    def _make_style(self, font_size, bg_opacity, text_opacity):
-        return f"""
-            background: transparent;
-            color: rgba(255,255,255,{text_opacity});
-            font-family: 'Segoe UI', 'Roboto', Arial, sans-serif;
-            font-size: {font_size}px;
-            padding: 0px 8px;
-            border: none;
-            text-align: center;
-            text-shadow: 0px 0px 4px #000, 2px 2px 4px #000, -2px 2px 4px #000, 2px -2px 4px #000, -2px -2px 4px #000;
-        """
+    def text(self):
+        return self._text
+
+    def _text_path(self):
+        """Return the cached outline path for the current text, font and width."""
+        key = (self._text, self.font_size, self.width())
+        path = self._layout_cache.get(key)
+        if path is not None:
+            self._layout_cache.move_to_end(key)
+            return path
+
+        # Lines are laid out upwards from y=0 so the path stays valid when only
+        # the widget height changes; paintEvent translates it to the bottom edge.
+        metrics = QFontMetrics(self._text_font)
+        lines = self._text.split("\n")
+        path = QPainterPath()
+        baseline = -metrics.descent()
+        for line in reversed(lines):
+            x = (self.width() - metrics.horizontalAdvance(line)) / 2
+            path.addText(x, baseline, self._text_font, line)
+            baseline -= metrics.lineSpacing()
+
+        self._layout_cache[key] = path
+        if len(self._layout_cache) > self.LAYOUT_CACHE_SIZE:
+            self._layout_cache.popitem(last=False)
+        return path
+
+    def paintEvent(self, event):
+        if not self._text:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        if self.bg_opacity > 0:
+            painter.fillRect(self.rect(), QColor(0, 0, 0, int(self.bg_opacity * 255)))
+        painter.setOpacity(self.text_opacity)
+        painter.translate(0, self.height() - self.PADDING)
+        path = self._text_path()
+        painter.strokePath(path, self._outline_pen)
+        painter.fillPath(path, self._text_brush)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
@@ -89,7 +164,9 @@ class SubtitleOverlay(QLabel):
             self.setGeometry(x, y, width, height)
 
     def set_subtitle(self, text):
-        self.setText(text)
+        if text != self._text:
+            self._text = text
+            self.update()
         self.setVisible(self._visible and bool(text.strip()))
 
     def show_settings(self):
@@ -98,16 +175,20 @@ class SubtitleOverlay(QLabel):
         self._settings_dialog.show()
 
     def set_font_size(self, size):
+        if size == self.font_size:
+            return
         self.font_size = size
-        self.setStyleSheet(self._make_style(self.font_size, self.bg_opacity, self.text_opacity))
+        self._text_font.setPixelSize(size)
+        self._layout_cache.clear()
+        self.update()
 
     def set_bg_opacity(self, opacity):
         self.bg_opacity = 0
-        self.setStyleSheet(self._make_style(self.font_size, 0, self.text_opacity))
+        self.update()
 
     def set_text_opacity(self, opacity):
         self.text_opacity = opacity
-        self.setStyleSheet(self._make_style(self.font_size, self.bg_opacity, self.text_opacity))
+        self.update()
 
     def set_subtitle_visible(self, visible):
         self._visible = visible
@@ -157,7 +238,7 @@ class SubtitleSettingsDialog(QDialog):
 
 
 class VideoPlayerScreen(QMainWindow):
-    def __init__(self):
+    def __init__(self, hub=None):
         super().__init__()
         self.setWindowTitle("Holoyomi Video Player")
         self.resize(960, 600)
@@ -277,6 +358,33 @@ class VideoPlayerScreen(QMainWindow):
         self.play_btn.clicked.connect(self.toggle_play)
         button_row.addWidget(self.play_btn)
         
+        # Playlist previous/next buttons
+        self.prev_btn = QPushButton()
+        self.prev_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaSkipBackward))
+        self.prev_btn.setToolTip("Previous (Shift+P)")
+        self.next_btn = QPushButton()
+        self.next_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaSkipForward))
+        self.next_btn.setToolTip("Next (Shift+N)")
+        for btn in (self.prev_btn, self.next_btn):
+            btn.setFixedSize(40, 40)
+            btn.setCursor(Qt.PointingHandCursor)
+            btn.setEnabled(False)
+            btn.setStyleSheet("""
+                QPushButton {
+                    background: transparent;
+                    border: none;
+                    border-radius: 20px;
+                    color: white;
+                    padding: 8px;
+                }
+                QPushButton:hover {
+                    background: rgba(255, 255, 255, 0.15);
+                }
+            """)
+            button_row.addWidget(btn)
+        self.prev_btn.clicked.connect(self.play_previous)
+        self.next_btn.clicked.connect(self.play_next)
+        
         # Volume button + slider
         self.volume_btn = QPushButton("🔊")
         self.volume_btn.setFixedSize(40, 40)
@@ -357,6 +465,46 @@ class VideoPlayerScreen(QMainWindow):
         self.subtitle_settings_btn.clicked.connect(self.subtitle_overlay.show_settings)
         button_row.addWidget(self.subtitle_settings_btn)
         
+        # Playlist button
+        self.playlist_btn = QPushButton("☰")
+        self.playlist_btn.setToolTip("Playlist")
+        self.playlist_btn.setFixedSize(40, 40)
+        self.playlist_btn.setCursor(Qt.PointingHandCursor)
+        self.playlist_btn.setStyleSheet("""
+            QPushButton {
+                background: transparent;
+                border: none;
+                border-radius: 20px;
+                color: white;
+                font-size: 18px;
+            }
+            QPushButton:hover {
+                background: rgba(255, 255, 255, 0.15);
+            }
+        """)
+        self.playlist_btn.clicked.connect(self.toggle_playlist_panel)
+        button_row.addWidget(self.playlist_btn)
+        
+        # Transcript search button
+        self.transcript_btn = QPushButton("🔍")
+        self.transcript_btn.setToolTip("Search transcript (Ctrl+F)")
+        self.transcript_btn.setFixedSize(40, 40)
+        self.transcript_btn.setCursor(Qt.PointingHandCursor)
+        self.transcript_btn.setStyleSheet("""
+            QPushButton {
+                background: transparent;
+                border: none;
+                border-radius: 20px;
+                color: white;
+                font-size: 18px;
+            }
+            QPushButton:hover {
+                background: rgba(255, 255, 255, 0.15);
+            }
+        """)
+        self.transcript_btn.clicked.connect(self.toggle_transcript_panel)
+        button_row.addWidget(self.transcript_btn)
+        
         # Settings button (gear icon)
         self.settings_btn = QPushButton("⚙")
         self.settings_btn.setToolTip("Settings")
@@ -406,23 +554,106 @@ class VideoPlayerScreen(QMainWindow):
         self.controls = controls
         vbox.addWidget(self.controls)
         
+        # Transcript search panel (hidden until toggled)
+        self.transcript_dock = QDockWidget("Transcript", self)
+        transcript_panel = QWidget()
+        transcript_layout = QVBoxLayout(transcript_panel)
+        transcript_layout.setContentsMargins(6, 6, 6, 6)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("Search JP / EN...")
+        self.search_results = QListWidget()
+        self.search_results.setWordWrap(True)
+        self.search_results.itemActivated.connect(self._jump_to_result)
+        self.search_results.itemClicked.connect(self._jump_to_result)
+        transcript_layout.addWidget(self.search_box)
+        transcript_layout.addWidget(self.search_results)
+        self.transcript_dock.setWidget(transcript_panel)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.transcript_dock)
+        self.transcript_dock.hide()
+        # Debounce so typing doesn't search on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_transcript_search)
+        self.search_box.textChanged.connect(lambda _: self.search_timer.start())
+        self.search_box.returnPressed.connect(self.run_transcript_search)
+        QShortcut(QKeySequence.Find, self, activated=self.toggle_transcript_panel)
+        
+        # Playlist panel (hidden until toggled)
+        self.playlist_dock = QDockWidget("Playlist", self)
+        playlist_panel = QWidget()
+        playlist_layout = QVBoxLayout(playlist_panel)
+        playlist_layout.setContentsMargins(6, 6, 6, 6)
+        self.playlist_list = QListWidget()
+        self.playlist_list.itemActivated.connect(lambda item: self.play_index(self.playlist_list.row(item)))
+        add_btn = QPushButton("Add videos...")
+        add_btn.clicked.connect(self.choose_playlist_files)
+        playlist_layout.addWidget(self.playlist_list)
+        playlist_layout.addWidget(add_btn)
+        self.playlist_dock.setWidget(playlist_panel)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.playlist_dock)
+        self.playlist_dock.hide()
+        QShortcut(QKeySequence("Shift+N"), self, activated=self.play_next)
+        QShortcut(QKeySequence("Shift+P"), self, activated=self.play_previous)
+        
         # Event filters
         self.video_frame.installEventFilter(self)
         
         # Pipeline setup
-        self.pipeline_thread = None
-        self.translation_cache = {}
-        self.processing_done = threading.Event()
-        self.translator = JPToENTranslator() if USE_TRANSLATION else None
+        # The hub (model, translator + cache, translation pool) is shared by
+        # every player open at once; a lone player gets its own. It may also
+        # be a client of the resident service (service/), which runs the
+        # same sessions out of process.
+        if hub is None:
+            hub = create_hub()
+        self.hub = hub
+        self.session = None
+        self.segments = SegmentStore()  # replaced by the session's store for each video
+        self.playlist = []
+        self.playlist_index = -1
         
         # Signals for thread-safe updates
         self.signals = SubtitleSignals()
-        self.signals.update_text.connect(self._update_subtitle_slot)
+        self.signals.segments_changed.connect(self.schedule_ui_update)
         
-        # UI update timer
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.ui_update_loop)
-        self.update_timer.start(100)
+        # Player state is pushed by VLC's event manager; the single-shot timer
+        # coalesces bursts of events into at most one refresh per display frame
+        # and stays idle while paused or minimized.
+        self._player_time = 0
+        self._player_length = 0
+        self._ui_dirty = False
+        self._window_state_hooked = False
+        self.player_signals = PlayerSignals()
+        self.player_signals.time_changed.connect(self._on_time_changed)
+        self.player_signals.length_changed.connect(self._on_length_changed)
+        self.player_signals.state_changed.connect(self._on_state_changed)
+
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        refresh_rate = QApplication.primaryScreen().refreshRate() if QApplication.primaryScreen() else 60
+        self.update_timer.setInterval(max(1, int(1000 / (refresh_rate or 60))))
+        self.update_timer.timeout.connect(self.refresh_player_ui)
+
+        # Lost pictures tell the governor when background work hurts playback;
+        # polled only while playing and visible, like the UI timer idles
+        self._playing = False
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(1000)
+        self.stats_timer.timeout.connect(self._report_playback_stats)
+
+        events = self.vlc_player.event_manager()
+        events.event_attach(vlc.EventType.MediaPlayerTimeChanged,
+                            lambda e: self.player_signals.time_changed.emit(e.u.new_time))
+        events.event_attach(vlc.EventType.MediaPlayerLengthChanged,
+                            lambda e: self.player_signals.length_changed.emit(e.u.new_length))
+        events.event_attach(vlc.EventType.MediaPlayerPlaying,
+                            lambda e: self.player_signals.state_changed.emit("playing"))
+        events.event_attach(vlc.EventType.MediaPlayerPaused,
+                            lambda e: self.player_signals.state_changed.emit("paused"))
+        events.event_attach(vlc.EventType.MediaPlayerStopped,
+                            lambda e: self.player_signals.state_changed.emit("stopped"))
+        events.event_attach(vlc.EventType.MediaPlayerEndReached,
+                            lambda e: self.player_signals.state_changed.emit("ended"))
 
     def eventFilter(self, obj, event):
         if obj == self.video_frame and event.type() == event.Resize:
@@ -451,125 +682,209 @@ class VideoPlayerScreen(QMainWindow):
         elif sys.platform == "darwin":
             self.vlc_player.set_nsobject(int(self.video_frame.winId()))
         
+        # Leave the previous video: its pipeline stops and its queued
+        # translations become background work
+        if self.session:
+            self.session.stop()
+            self.segments.unsubscribe(self._on_segment_event)
+        self._player_time = self._player_length = 0
+        
         media = self.vlc_instance.media_new(path)
         self.vlc_player.set_media(media)
         self.vlc_player.play()
         self.play_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPause))
+        self.schedule_ui_update()
         
-        # Extract audio from video to temp WAV
-        audio_path = os.path.splitext(path)[0] + "_holoyomi_temp.wav"
-        if not os.path.exists(audio_path):
-            try:
-                print(f"[INFO] Extracting audio to {audio_path}...")
-                (
-                    ffmpeg
-                    .input(path)
-                    .output(audio_path, acodec='pcm_s16le', ac=1, ar=SAMPLERATE, loglevel='error')
-                    .overwrite_output()
-                    .run()
-                )
-                print("[INFO] Audio extraction complete")
-            except Exception as e:
-                print(f"[ERROR] Could not extract audio: {e}")
-                audio_path = path
-        
-        # Start pipeline in thread
-        self.pipeline_thread = threading.Thread(target=self.run_pipeline, args=(audio_path,), daemon=True)
-        self.pipeline_thread.start()
+        # Start the pipeline; its store fills in from other threads (or the service)
+        self.session = self.hub.open_session(path, self.playhead)
+        self.segments = self.session.store
+        self.segments.subscribe(self._on_segment_event)
+
+    def set_playlist(self, paths):
+        self.playlist = []
+        self.playlist_list.clear()
+        self.add_to_playlist(paths)
+        self.play_index(0)
+
+    def add_to_playlist(self, paths):
+        for path in paths:
+            self.playlist.append(path)
+            self.playlist_list.addItem(os.path.basename(path))
+        self._update_playlist_controls()
+
+    def choose_playlist_files(self):
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "Add videos", "", "Video files (*.mp4 *.mkv *.avi *.mov *.flv *.webm);;All files (*.*)"
+        )
+        if not paths:
+            return
+        start = not self.playlist
+        self.add_to_playlist(paths)
+        if start:
+            self.play_index(0)
+
+    def play_index(self, index):
+        if not 0 <= index < len(self.playlist):
+            return
+        self.playlist_index = index
+        self.playlist_list.setCurrentRow(index)
+        self.setWindowTitle(f"Holoyomi Video Player - {os.path.basename(self.playlist[index])}")
+        self.load_video(self.playlist[index])
+        self._update_playlist_controls()
+
+    def play_next(self):
+        self.play_index(self.playlist_index + 1)
+
+    def play_previous(self):
+        self.play_index(self.playlist_index - 1)
+
+    def toggle_playlist_panel(self):
+        self.playlist_dock.setVisible(not self.playlist_dock.isVisible())
+
+    def _update_playlist_controls(self):
+        self.prev_btn.setEnabled(self.playlist_index > 0)
+        self.next_btn.setEnabled(self.playlist_index + 1 < len(self.playlist))
+        # Get the next few items extracted, transcribed and translated while this one plays
+        upcoming = self.playlist[self.playlist_index + 1:self.playlist_index + 1 + PRELOAD_ITEMS]
+        self.hub.schedule_upcoming(self, upcoming)
 
     def toggle_play(self):
+        # The play button icon follows the VLC state events
         if self.vlc_player.is_playing():
             self.vlc_player.pause()
-            self.play_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
         else:
             self.vlc_player.play()
-            self.play_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPause))
 
     def stop_video(self):
         self.vlc_player.stop()
-        self.play_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
 
     def set_position(self, position):
         self.vlc_player.set_position(position / 1000.0)
+        if self._player_length > 0:
+            self._player_time = int(self._player_length * position / 1000.0)
+            self.request_seek(self._player_time / 1000.0)
+            self.schedule_ui_update()
 
     def set_volume(self, volume):
         self.vlc_player.audio_set_volume(volume)
 
-    def ui_update_loop(self):
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._window_state_hooked and self.window().windowHandle():
+            self.window().windowHandle().windowStateChanged.connect(self._on_window_state_changed)
+            self._window_state_hooked = True
+
+    def _on_window_state_changed(self, state):
+        self._update_stats_timer()
+        if not (state & Qt.WindowMinimized) and self._ui_dirty:
+            self.schedule_ui_update()
+
+    def _update_stats_timer(self):
+        if self._playing and not self.window().isMinimized():
+            if not self.stats_timer.isActive():
+                self.stats_timer.start()
+        else:
+            self.stats_timer.stop()
+
+    def _on_time_changed(self, time_ms):
+        self._player_time = time_ms
+        self.schedule_ui_update()
+
+    def _on_length_changed(self, length_ms):
+        self._player_length = length_ms
+        self.schedule_ui_update()
+
+    def _on_state_changed(self, state):
+        icon = QStyle.SP_MediaPause if state == "playing" else QStyle.SP_MediaPlay
+        self.play_btn.setIcon(self.style().standardIcon(icon))
+        self._playing = state == "playing"
+        self._update_stats_timer()
+        if state in ("stopped", "ended"):
+            self._player_time = self._player_length if state == "ended" else 0
+        self.schedule_ui_update()
+        if state == "ended" and self.playlist_index + 1 < len(self.playlist):
+            self.play_next()
+
+    def _report_playback_stats(self):
+        media = self.vlc_player.get_media()
+        if media is None:
+            return
+        stats = vlc.MediaStats()
+        if media.get_stats(stats):
+            self.hub.report_playback(self, stats.lost_pictures, stats.displayed_pictures)
+
+    def schedule_ui_update(self):
+        """Request a player UI refresh, coalesced to one per display frame."""
+        self._ui_dirty = True
+        if self.window().isMinimized() or self.update_timer.isActive():
+            return
+        self.update_timer.start()
+
+    def refresh_player_ui(self):
         # Update position slider and time marker
-        length = self.vlc_player.get_length()
+        self._ui_dirty = False
+        length = self._player_length
         if length > 0:
-            pos = int(self.vlc_player.get_position() * 1000)
+            pos = int(self._player_time * 1000 / length)
             self.position_slider.blockSignals(True)
             self.position_slider.setValue(pos)
             self.position_slider.blockSignals(False)
-            cur_sec = int(self.vlc_player.get_time() / 1000)
-            total_sec = int(length / 1000)
-            def fmt(secs):
-                m, s = divmod(secs, 60)
-                return f"{m:02}:{s:02}"
-            self.time_label.setText(f"{fmt(cur_sec)} / {fmt(total_sec)}")
+            self.time_label.setText(f"{format_timestamp(self._player_time)} / {format_timestamp(length)}")
         else:
             self.time_label.setText("00:00 / 00:00")
+        self._refresh_subtitle()
 
-    def update_subtitle(self, jp_text, en_text=None):
-        """Thread-safe subtitle update - use signals"""
-        self.signals.update_text.emit(jp_text, en_text if en_text else "")
+    def _refresh_subtitle(self):
+        """Show the segment under the playhead (runs in main thread)"""
+        segment = self.segments.segment_at(self._player_time / 1000.0, SUBTITLE_HOLD_SECONDS)
+        self.subtitle_overlay.set_subtitle(segment.display_text() if segment else "")
 
-    def _update_subtitle_slot(self, jp_text, en_text):
-        """Actually update the subtitle (runs in main thread)"""
-        if en_text:
-            display_text = f"{jp_text}\n{en_text}"
-        else:
-            display_text = jp_text
-        self.subtitle_overlay.set_subtitle(display_text)
+    def playhead(self):
+        """Current playback position in seconds (safe to call from any thread)"""
+        return self._player_time / 1000.0
 
-    def run_pipeline(self, audio_file):
-        """Pipeline: Audio -> ASR -> Translation -> Subtitles"""
-        try:
-            print(f"[INFO] Starting pipeline with {audio_file}")
-            audio_capture = AudioFileCapture(audio_file, chunk_duration=CHUNK_DURATION, samplerate=SAMPLERATE)
-            asr = JapaneseASR(model_path=ASR_MODEL_PATH)
-            print("[INFO] ASR initialized")
-            
-            last_text = ""
-            while True:
-                chunk = audio_capture.get_chunk()
-                if chunk is None:
-                    break
-                
-                try:
-                    jp_text = asr.recognize(chunk).strip()
-                    if jp_text and jp_text != last_text:
-                        last_text = jp_text
-                        print(f"[ASR] {jp_text}")
-                        
-                        # Show Japanese immediately
-                        self.update_subtitle(jp_text)
-                        
-                        # Translate if enabled
-                        if self.translator:
-                            def translate_worker(jp):
-                                if jp in self.translation_cache:
-                                    en_text = self.translation_cache[jp]
-                                else:
-                                    en_text = self.translator.translate(jp)
-                                    self.translation_cache[jp] = en_text
-                                print(f"[EN] {en_text}")
-                                self.update_subtitle(jp, en_text)
-                            
-                            threading.Thread(target=translate_worker, args=(jp_text,), daemon=True).start()
-                
-                except Exception as e:
-                    print(f"[ERROR] Pipeline error: {e}")
-            
-            print("[INFO] Pipeline finished")
-            self.processing_done.set()
-        
-        except Exception as e:
-            print(f"[FATAL] Pipeline failed to start: {e}")
-            import traceback
-            traceback.print_exc()
+    def toggle_transcript_panel(self):
+        visible = not self.transcript_dock.isVisible()
+        self.transcript_dock.setVisible(visible)
+        if visible:
+            self.search_box.setFocus()
+            self.search_box.selectAll()
+
+    def run_transcript_search(self):
+        query = self.search_box.text().strip()
+        self.search_results.clear()
+        if not query:
+            self.transcript_dock.setWindowTitle("Transcript")
+            return
+        # One extra hit tells whether the list is cut
+        hits = self.segments.search(query, SEARCH_MAX_HITS + 1)
+        truncated = len(hits) > SEARCH_MAX_HITS
+        hits = hits[:SEARCH_MAX_HITS]
+        for segment in hits:
+            text = f"{format_timestamp(segment.start * 1000)}  {segment.jp}"
+            if segment.en:
+                text += f"\n{segment.en}"
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, segment.start)
+            self.search_results.addItem(item)
+        count = f"first {len(hits)} of more hits" if truncated else f"{len(hits)} hit(s)"
+        self.transcript_dock.setWindowTitle(f"Transcript - {count} in {len(self.segments)} lines")
+
+    def _jump_to_result(self, item):
+        start = item.data(Qt.UserRole)
+        self.vlc_player.set_time(int(start * 1000))
+        self._player_time = int(start * 1000)
+        self.request_seek(start)
+        self.schedule_ui_update()
+
+    def request_seek(self, seconds):
+        """Restart recognition at a new playhead (thread-safe)"""
+        if self.session:
+            self.session.seek(seconds)
+
+    def _on_segment_event(self, kind, segment):
+        # Called on pipeline/translation threads; hop to the Qt thread
+        self.signals.segments_changed.emit()
 
 
 class PixelMenu(QWidget):
@@ -689,8 +1004,11 @@ class PixelMenu(QWidget):
             print(f"[ERROR] Animation error: {e}")
 
 def main():
-    app = QApplication(sys.argv)
-    print("[DEBUG] App started")
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--chunk-preset", choices=sorted(CHUNK_PRESETS), default=CHUNK_PRESET)
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+    print(f"[DEBUG] App started (chunk preset: {args.chunk_preset})")
     
     main_window = QMainWindow()
     main_window.setWindowTitle("Holoyomi")
@@ -706,28 +1024,61 @@ def main():
         print("[DEBUG] Start button clicked")
         file_dialog = QFileDialog(main_window)
         file_dialog.setNameFilters(["Video files (*.mp4 *.mkv *.avi *.mov *.flv *.webm)", "All files (*.*)"])
+        # Selecting several files opens one player per POV (multi-stream mode)
+        file_dialog.setFileMode(QFileDialog.ExistingFiles)
         if not file_dialog.exec_():
             print("[DEBUG] File dialog cancelled")
             return
         
-        video_path = file_dialog.selectedFiles()[0]
-        if not os.path.exists(video_path):
+        video_paths = file_dialog.selectedFiles()
+        missing = [p for p in video_paths if not os.path.exists(p)]
+        if not video_paths or missing:
             QMessageBox.critical(main_window, "File Error", "Selected file does not exist.")
-            print("[DEBUG] File does not exist")
+            print(f"[DEBUG] File does not exist: {missing}")
             return
         
-        print(f"[DEBUG] Loading video: {video_path}")
+        print(f"[DEBUG] Loading video(s): {video_paths}")
         
-        # Remove menu and show video player
+        # Several files: one playlist (next ones prepared in the background)
+        # or one player per POV side by side
+        as_playlist = True
+        if len(video_paths) > 1:
+            choice = QMessageBox(main_window)
+            choice.setWindowTitle("Open videos")
+            choice.setText(f"Open {len(video_paths)} videos as a playlist or side by side?")
+            playlist_btn = choice.addButton("Playlist", QMessageBox.AcceptRole)
+            choice.addButton("Side by side", QMessageBox.AcceptRole)
+            choice.exec_()
+            as_playlist = choice.clickedButton() == playlist_btn
+        
+        # Remove menu and show video player(s)
         for i in reversed(range(vbox.count())):
             widget = vbox.itemAt(i).widget()
             if widget:
                 widget.setParent(None)
         
-        player = VideoPlayerScreen()
-        vbox.addWidget(player)
-        player.show()
-        player.load_video(video_path)
+        hub = create_hub(args.chunk_preset)
+        app.aboutToQuit.connect(hub.shutdown)  # saves transcripts for later reuse (or detaches)
+        if as_playlist:
+            player = VideoPlayerScreen(hub=hub)
+            vbox.addWidget(player)
+            player.show()
+            player.set_playlist(video_paths)
+            return
+        grid_widget = QWidget()
+        grid = QGridLayout(grid_widget)
+        grid.setContentsMargins(0, 0, 0, 0)
+        grid.setSpacing(2)
+        columns = math.ceil(math.sqrt(len(video_paths)))
+        vbox.addWidget(grid_widget)
+        players = []
+        for index, video_path in enumerate(video_paths):
+            player = VideoPlayerScreen(hub=hub)
+            grid.addWidget(player, index // columns, index % columns)
+            player.show()
+            players.append(player)
+        for player, video_path in zip(players, video_paths):
+            player.set_playlist([video_path])
 
     menu = PixelMenu(start_clicked)
     vbox.addWidget(menu)
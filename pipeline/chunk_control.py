@@ -0,0 +1,51 @@
+"""
+Adaptive audio chunk sizing from measured recognizer cost
+"""
+
+
+class ChunkController:
+    """Picks the next chunk duration to keep end-to-end latency near a target.
+
+    A line can't be recognized before its chunk is complete and decoded, so
+    latency ~= chunk * (1 + rtf) + lag, where rtf is decode seconds per audio
+    second and lag is how far the pipeline is behind its clock. The controller
+    keeps EWMAs of rtf and lag and moves the chunk toward the duration that
+    meets the target. When decoding can't keep up (rtf near 1 or lag rising)
+    it grows the chunk instead, since fewer AcceptWaveform calls means less
+    fixed per-call overhead.
+    """
+    OVERLOAD_RTF = 0.9
+
+    def __init__(self, initial, min_duration, max_duration, target_latency, smoothing=0.2):
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.target_latency = target_latency
+        self.smoothing = smoothing
+        self.duration = self._clamp(initial)
+        self.rtf = 0.0
+        self.lag = 0.0
+        self._observed = 0
+
+    @classmethod
+    def from_preset(cls, preset, initial):
+        return cls(initial, preset["min"], preset["max"], preset["target_latency"])
+
+    def _clamp(self, duration):
+        return max(self.min_duration, min(self.max_duration, duration))
+
+    def observe(self, chunk_seconds, decode_seconds, lag=0.0):
+        """Record one decoded chunk; returns the duration to use for the next one."""
+        if chunk_seconds <= 0:
+            return self.duration
+        a = self.smoothing if self._observed else 1.0
+        self._observed += 1
+        lag_rising = lag > self.lag + chunk_seconds
+        self.rtf += a * (decode_seconds / chunk_seconds - self.rtf)
+        self.lag += a * (lag - self.lag)
+
+        if self.rtf >= self.OVERLOAD_RTF or lag_rising:
+            desired = self.duration * 1.25
+        else:
+            desired = max(0.0, self.target_latency - self.lag) / (1.0 + self.rtf)
+        self.duration = self._clamp(self.duration + self.smoothing * (desired - self.duration))
+        return self.duration
@@ -0,0 +1,112 @@
+"""
+CPU governor keeping ASR, ffmpeg and background work out of video playback's way
+"""
+import os
+import sys
+import threading
+import time
+
+from config import (
+    PLAYBACK_RESERVED_CORES, ASR_NICE, BACKGROUND_NICE, LOST_PICTURE_RATIO, THROTTLE_RELEASE_SECONDS,
+)
+
+MIN_PICTURES = 10  # pictures per poll below which a lost-picture ratio means little
+
+
+class ResourceGovernor:
+    """Thread budgets, nice/affinity settings and a playback-driven throttle.
+
+    The first reserved_cores of the process's CPUs are left to VLC, which
+    decodes video inside this process: recognizer threads, ASR worker
+    processes and ffmpeg are pinned to the remaining "work" cores, and their
+    number is the ASR/ffmpeg thread budget. Roles set niceness: "asr" for work
+    the playing video waits on, "background" for everything else.
+
+    Players report VLC's cumulative lost/displayed picture counters; when the
+    share of lost pictures between two reports exceeds lost_ratio, background
+    work is paused (wait_background() blocks) until playback has stayed
+    smooth for release_seconds.
+
+    Per-thread settings only exist on Linux; elsewhere apply() only affects
+    child processes, and quietly does nothing the OS doesn't support.
+    """
+
+    def __init__(self, reserved_cores=PLAYBACK_RESERVED_CORES, asr_nice=ASR_NICE, background_nice=BACKGROUND_NICE,
+                 lost_ratio=LOST_PICTURE_RATIO, release_seconds=THROTTLE_RELEASE_SECONDS, clock=time.monotonic):
+        if hasattr(os, "sched_getaffinity"):
+            cores = sorted(os.sched_getaffinity(0))
+        else:
+            cores = list(range(os.cpu_count() or 1))
+        reserved = min(reserved_cores, len(cores) - 1)
+        self.work_cores = cores[reserved:]
+        self.pin = reserved > 0
+        self.thread_budget = len(self.work_cores)
+        self.nice = {"asr": asr_nice, "background": background_nice}
+        self.lost_ratio = lost_ratio
+        self.release_seconds = release_seconds
+        self.clock = clock
+        self.throttle_events = 0
+        self._clear = threading.Event()
+        self._clear.set()
+        self._lock = threading.Lock()
+        self._counters = {}  # source -> (lost, displayed) at the last report
+        self._release_at = 0.0
+
+    @property
+    def throttled(self):
+        return not self._clear.is_set()
+
+    def apply(self, role, pid=None):
+        """Give a child process (pid) or else the calling thread the settings for role."""
+        if pid is None:
+            if not sys.platform.startswith("linux"):
+                return  # there niceness and affinity would hit the whole app, VLC included
+            pid = threading.get_native_id()
+        if self.pin and hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(pid, self.work_cores)
+            except OSError as e:
+                print(f"[Governor] Could not set CPU affinity: {e}")
+        if hasattr(os, "setpriority"):
+            try:
+                # Raising niceness is always allowed; lowering it may not be
+                if os.getpriority(os.PRIO_PROCESS, pid) < self.nice[role]:
+                    os.setpriority(os.PRIO_PROCESS, pid, self.nice[role])
+            except OSError as e:
+                print(f"[Governor] Could not set priority: {e}")
+
+    def ffmpeg_threads(self, role):
+        return 1 if role == "background" else self.thread_budget
+
+    def report_playback(self, source, lost, displayed):
+        """Feed one player's cumulative VLC picture counters."""
+        with self._lock:
+            last_lost, last_displayed = self._counters.get(source, (0, 0))
+            self._counters[source] = (lost, displayed)
+            if lost < last_lost or displayed < last_displayed:
+                return  # new media, counters restarted
+            lost, displayed = lost - last_lost, displayed - last_displayed
+            now = self.clock()
+            if lost + displayed >= MIN_PICTURES and lost > self.lost_ratio * (lost + displayed):
+                self._release_at = now + self.release_seconds
+                if self._clear.is_set():
+                    self._clear.clear()
+                    self.throttle_events += 1
+                    print(f"[Governor] Playback dropped {lost}/{lost + displayed} pictures; pausing background work")
+            elif not self._clear.is_set() and now >= self._release_at:
+                self._clear.set()
+                print("[Governor] Playback smooth again; resuming background work")
+
+    def forget(self, source):
+        with self._lock:
+            self._counters.pop(source, None)
+
+    def wait_background(self, timeout=None):
+        """Block while playback is suffering; True once background work may run."""
+        if self._clear.wait(timeout):
+            return True
+        with self._lock:
+            # No player reporting any more (paused, closed): nothing to protect
+            if self.clock() >= self._release_at + self.release_seconds:
+                self._clear.set()
+        return self._clear.is_set()
@@ -0,0 +1,227 @@
+"""
+Resources shared by every open player in multi-stream mode
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+from config import (
+    ASR_MODEL_PATH, USE_TRANSLATION, LOOKAHEAD_SECONDS, SUBTITLE_HOLD_SECONDS,
+    TRANSLATION_WORKERS, ASR_DECODE_SLOTS, USE_ASR_PROCESS, ASR_RING_SECONDS, SAMPLERATE,
+    CHUNK_PRESET, CHUNK_PRESETS, TRANSLATION_EXPIRE_SECONDS,
+    USE_TRANSCRIPT_REUSE, TRANSCRIPT_CACHE_DIR, FINGERPRINT_MIN_MATCH_SECONDS,
+)
+from asr.jp_asr import JapaneseASR, load_model
+from asr.asr_worker import ProcessASR
+from audio.audio_cache import AudioCache, media_hash, PCM_SUFFIX
+from audio.fingerprint import FingerprintIndex, shifted_fingerprints
+from pipeline.scheduler import DeadlineScheduler
+from pipeline.segments import SegmentStore
+from pipeline.preprocess import Preprocessor, translate_into
+from pipeline.governor import ResourceGovernor
+from pipeline.session import MediaSession
+if USE_TRANSLATION:
+    from translate.jp_to_en import JPToENTranslator
+else:
+    JPToENTranslator = None
+
+
+class StreamHub:
+    """One Vosk model, one translator (and its cache), one translation pool,
+    one extracted-audio cache, and one SegmentStore per media file.
+
+    Each stream still gets its own KaldiRecognizer from acquire_asr(); the
+    decode_slots semaphore caps how many of them decode at once so N streams
+    are spread over the governor's work cores instead of oversubscribing
+    them and starving VLC.
+    The preprocessor fills the stores of upcoming playlist items in the
+    background with whatever slots are left.
+
+    Transcripts are saved next to an audio fingerprint of their file, so a
+    re-upload, a clip or the same file next session starts with every
+    stretch of audio that was already transcribed.
+    """
+
+    def __init__(self, model_path=ASR_MODEL_PATH, decode_slots=ASR_DECODE_SLOTS, use_asr_process=USE_ASR_PROCESS,
+                 chunk_preset=CHUNK_PRESET, asr_pool_size=0, transcript_dir=TRANSCRIPT_CACHE_DIR):
+        self.model_path = model_path
+        self.transcript_dir = transcript_dir
+        self.asr_pool_size = asr_pool_size
+        self._idle_asr = []
+        self._idle_asr_lock = threading.Lock()
+        self.chunk_preset = CHUNK_PRESETS.get(chunk_preset, CHUNK_PRESETS["balanced"])
+        self.use_asr_process = use_asr_process
+        self.governor = ResourceGovernor()
+        self.decode_slots = threading.BoundedSemaphore(
+            min(decode_slots or os.cpu_count() or 1, self.governor.thread_budget)
+        )
+        self.audio_cache = AudioCache()
+        self.translator = JPToENTranslator() if JPToENTranslator else None
+        self.translation_scheduler = DeadlineScheduler(
+            lookahead=LOOKAHEAD_SECONDS, grace=SUBTITLE_HOLD_SECONDS,
+            num_workers=TRANSLATION_WORKERS, name="translate",
+            expire_after=TRANSLATION_EXPIRE_SECONDS,
+        ) if self.translator else None
+        self._stores = {}
+        self._stores_lock = threading.Lock()
+        self.fingerprints = FingerprintIndex(transcript_dir, SAMPLERATE) if USE_TRANSCRIPT_REUSE else None
+        self._media_keys = {}  # store path -> media hash, for fingerprinted files
+        self._fingerprint_lock = threading.Lock()
+        self.preprocessor = Preprocessor(self)
+
+    def preload(self):
+        """Load the shared model up front (e.g. before opening several players)
+        and fill the idle recognizer pool."""
+        if not self.use_asr_process:
+            load_model(self.model_path)
+        while len(self._idle_asr) < self.asr_pool_size:
+            self._idle_asr.append(self.create_asr())
+
+    def open_session(self, media_path, playhead_fn, name="player"):
+        """Start recognizing media_path around playhead_fn(); returns the running MediaSession."""
+        return MediaSession(self, media_path, playhead_fn, name=name).start()
+
+    def schedule_upcoming(self, owner, media_paths):
+        self.preprocessor.schedule(owner, media_paths)
+
+    def report_playback(self, owner, lost, displayed):
+        self.governor.report_playback(owner, lost, displayed)
+
+    def segment_store(self, media_path):
+        """The transcript of media_path, shared by its player and the preprocessor."""
+        key = os.path.abspath(media_path)
+        with self._stores_lock:
+            if key not in self._stores:
+                self._stores[key] = SegmentStore()
+            return self._stores[key]
+
+    def adopt_store(self, media_path, store):
+        """Use store as media_path's transcript (e.g. lines received from a service that went away)."""
+        with self._stores_lock:
+            self._stores[os.path.abspath(media_path)] = store
+
+    def extract_audio(self, media_path, role="asr"):
+        """Cached PCM for media_path; ffmpeg runs within the governor's budget for role."""
+        return self.audio_cache.get(
+            media_path, threads=self.governor.ffmpeg_threads(role),
+            process_hook=lambda pid: self.governor.apply(role, pid),
+        )
+
+    def reuse_transcripts_async(self, media_path, audio_file):
+        def run():
+            self.governor.apply("background")
+            self.reuse_transcripts(media_path, audio_file)
+        threading.Thread(target=run, name="fingerprint", daemon=True).start()
+
+    def reuse_transcripts(self, media_path, audio_file):
+        """Fill media_path's store with lines already transcribed from the same audio.
+
+        Fingerprints the extracted audio, finds stretches heard before in
+        other files (or this one in an earlier session) and copies their
+        lines with the time offset, so only unmatched audio goes through ASR
+        and translation. Runs once per file per session.
+        """
+        if not self.fingerprints or not audio_file.endswith(PCM_SUFFIX):
+            return
+        path = os.path.abspath(media_path)
+        with self._fingerprint_lock:
+            if path in self._media_keys:
+                return
+            key = self._media_keys[path] = media_hash(media_path)
+        store = self.segment_store(media_path)
+        # Clips are cut at arbitrary samples, so the query is tried at sub-hop shifts
+        queries = shifted_fingerprints(np.memmap(audio_file, dtype=np.int16, mode="r"), SAMPLERATE)
+        with self._fingerprint_lock:
+            matches = self.fingerprints.find_shifted(queries, min_seconds=FINGERPRINT_MIN_MATCH_SECONDS)
+            self.fingerprints.add(key, queries[0][1])
+
+        for ref_key, offset, start, end in matches:
+            ref = self._transcript(ref_key, exclude=store)
+            if ref is None:
+                continue
+            copied = store.reuse(ref, offset, start, end)
+            if not copied:
+                continue
+            with self._fingerprint_lock:
+                self.fingerprints.touch(ref_key)
+            print(f"[INFO] Reused {len(copied)} lines for {start:.0f}-{end:.0f}s of "
+                  f"{os.path.basename(media_path)} (offset {offset:+.1f}s)")
+            if self.translation_scheduler:
+                for segment in copied:
+                    if not segment.en:
+                        self.translation_scheduler.submit(
+                            segment.start, translate_into, self.translator, store, segment,
+                            playhead_fn=store.playhead,
+                        )
+
+    def _transcript(self, key, exclude=None):
+        """The transcript saved under a media hash: the live store if open, else from disk."""
+        with self._fingerprint_lock:
+            paths = [path for path, k in self._media_keys.items() if k == key]
+        with self._stores_lock:
+            for path in paths:
+                store = self._stores.get(path)
+                if store is not None and store is not exclude:
+                    return store
+        try:
+            with open(os.path.join(self.transcript_dir, key + ".json"), encoding="utf-8") as f:
+                return SegmentStore.from_dict(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def save_transcript(self, media_path):
+        """Write media_path's transcript next to its fingerprint for later reuse."""
+        path = os.path.abspath(media_path)
+        with self._fingerprint_lock:
+            key = self._media_keys.get(path)
+        with self._stores_lock:
+            store = self._stores.get(path)
+        if key is None or store is None or not len(store):
+            return
+        target = os.path.join(self.transcript_dir, key + ".json")
+        try:
+            with open(target + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(store.to_dict(), f, ensure_ascii=False)
+            os.replace(target + ".tmp", target)
+        except OSError as e:
+            print(f"[ERROR] Could not save transcript: {e}")
+            return
+        with self._fingerprint_lock:
+            self.fingerprints.evict(keep=key)
+
+    def acquire_asr(self):
+        """A recognizer for a playing stream, from the idle pool when one is ready."""
+        with self._idle_asr_lock:
+            asr = self._idle_asr.pop() if self._idle_asr else None
+        if asr is None:
+            return self.create_asr()
+        asr.reset()
+        return asr
+
+    def release_asr(self, asr):
+        """Return a recognizer from acquire_asr(); kept for the next stream if the pool has room."""
+        if getattr(asr, "closed", False):
+            return  # its worker process died
+        with self._idle_asr_lock:
+            if len(self._idle_asr) < self.asr_pool_size:
+                self._idle_asr.append(asr)
+                return
+        if hasattr(asr, "close"):
+            asr.close()
+
+    def create_asr(self, role="asr"):
+        """A recognizer; a worker process gets the governor's settings for role."""
+        if self.use_asr_process:
+            asr = ProcessASR(self.model_path, ring_seconds=ASR_RING_SECONDS, samplerate=SAMPLERATE)
+            self.governor.apply(role, asr.process.pid)
+            return asr
+        return JapaneseASR(model_path=self.model_path)
+
+    def shutdown(self):
+        self.preprocessor.shutdown()
+        for path in list(self._media_keys):
+            self.save_transcript(path)
+        if self.translation_scheduler:
+            self.translation_scheduler.shutdown()
@@ -0,0 +1,107 @@
+"""
+Live audio pipeline: AudioCapture -> ASR -> Translation -> text callback
+"""
+import queue
+import threading
+import time
+
+from config import (
+    CHUNK_DURATION, SAMPLERATE, LOAD_SHED_THRESHOLDS, LOAD_SHED_EXIT_RATIO, LOAD_SHED_MIN_DWELL,
+    FILLER_MAX_CHARS, STALE_AUDIO_SECONDS, CHUNK_PRESET, CHUNK_PRESETS,
+)
+from audio.audio_capture import AudioCapture
+from pipeline.load_shedding import LoadShedder, is_filler
+from pipeline.chunk_control import ChunkController
+
+
+class LiveSession:
+    """Recognizes the capture device continuously and hands each line to on_text.
+
+    on_text(text) receives partial results, recognized JP lines and
+    "JP\\nEN" once a translation arrives; it is called from worker threads.
+    Used in-process by pipeline/runner.py and by the service for its clients.
+    """
+
+    def __init__(self, asr, translator, on_text, chunk_preset=None, name="live"):
+        self.asr = asr
+        self.translator = translator
+        self.on_text = on_text
+        preset = chunk_preset or CHUNK_PRESETS.get(CHUNK_PRESET, CHUNK_PRESETS["balanced"])
+        self.chunker = ChunkController.from_preset(preset, CHUNK_DURATION)
+        self.shedder = LoadShedder(
+            LOAD_SHED_THRESHOLDS, LOAD_SHED_EXIT_RATIO, LOAD_SHED_MIN_DWELL, name=name
+        )
+        self.audio = None
+        self._running = threading.Event()
+        self._translate_queue = queue.Queue()
+        self._threads = []
+
+    def start(self):
+        self.audio = AudioCapture(chunk_duration=self.chunker.duration, samplerate=SAMPLERATE)
+        self._running.set()
+        self._threads = [threading.Thread(target=self._processing_loop, name="live-asr", daemon=True)]
+        if self.translator:
+            self._threads.append(threading.Thread(target=self._translation_loop, name="live-translate", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stop capturing; returns the load shedding report."""
+        self._running.clear()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        if self.audio:
+            self.audio.close()
+        return self.shedder.report()
+
+    def _processing_loop(self):
+        audio, asr, shedder = self.audio, self.asr, self.shedder
+        while self._running.is_set():
+            try:
+                audio_chunk = audio.get_chunk(timeout=0.5)
+                if audio_chunk is None:
+                    continue
+                shedder.update(audio.lag())
+                if shedder.drop_stale:
+                    dropped = audio.drop_stale(STALE_AUDIO_SECONDS)
+                    if dropped:
+                        # The recognizer would otherwise splice unrelated audio together
+                        asr.reset()
+                        shedder.record("stale audio seconds", dropped)
+                        continue
+
+                decode_started = time.perf_counter()
+                text = asr.recognize(audio_chunk).strip()
+                audio.set_chunk_duration(self.chunker.observe(
+                    len(audio_chunk) / SAMPLERATE, time.perf_counter() - decode_started, audio.lag()
+                ))
+                if text:
+                    self.on_text(text)
+                    if not self.translator:
+                        continue
+                    if shedder.jp_only:
+                        shedder.record("translations (JP only)")
+                    elif shedder.skip_filler_translation and is_filler(text, FILLER_MAX_CHARS):
+                        shedder.record("filler translations")
+                    else:
+                        self._translate_queue.put(text)
+                elif shedder.skip_partials:
+                    shedder.record("partial results")
+                else:
+                    partial = asr.partial().strip()
+                    if partial:
+                        self.on_text(partial)
+            except Exception as e:
+                self.on_text("Error in processing")
+
+    def _translation_loop(self):
+        while self._running.is_set():
+            try:
+                jp_text = self._translate_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if self.shedder.jp_only:
+                self.shedder.record("translations (JP only)")
+                continue
+            self.on_text(f"{jp_text}\n{self.translator.translate(jp_text)}")
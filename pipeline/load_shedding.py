@@ -0,0 +1,103 @@
+"""
+Graduated load shedding when recognition falls behind realtime
+"""
+import time
+
+LEVEL_NAMES = (
+    "normal",
+    "skip partial results",
+    "skip filler translations",
+    "drop stale audio",
+    "JP only",
+)
+
+# Short interjections that are not worth a translation request under load
+FILLERS = {"えー", "えーと", "えっと", "あの", "あのー", "あー", "うん", "うーん", "はい", "ん", "まあ", "ね", "よし"}
+
+
+def is_filler(text, max_chars=3):
+    """True for very short lines and common interjections."""
+    compact = text.replace(" ", "")
+    return len(compact) <= max_chars or compact in FILLERS
+
+
+class LoadShedder:
+    """Maps pipeline lag (seconds behind the wall/media clock) to a shed level.
+
+    Levels are cumulative: each one also applies everything below it.
+    Escalation is immediate once lag crosses a level's enter threshold; stepping
+    back down needs lag below exit_ratio * that threshold for min_dwell seconds,
+    so a lag hovering near a threshold does not make the level flap.
+    """
+
+    def __init__(self, thresholds=(1.0, 2.0, 4.0, 8.0), exit_ratio=0.5, min_dwell=3.0,
+                 clock=time.monotonic, name="pipeline"):
+        self.thresholds = thresholds
+        self.exit_ratio = exit_ratio
+        self.min_dwell = min_dwell
+        self.clock = clock
+        self.name = name
+        self.level = 0
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._started = self._level_since = clock()
+        self._time_in_level = [0.0] * len(LEVEL_NAMES)
+        self.shed_counts = {}
+        self.transitions = []  # (seconds since start, lag, new level)
+
+    @property
+    def skip_partials(self):
+        return self.level >= 1
+
+    @property
+    def skip_filler_translation(self):
+        return self.level >= 2
+
+    @property
+    def drop_stale(self):
+        return self.level >= 3
+
+    @property
+    def jp_only(self):
+        return self.level >= 4
+
+    def update(self, lag):
+        """Feed the current lag; returns the (possibly new) level."""
+        now = self.clock()
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+
+        target = self.level
+        while target < len(self.thresholds) and lag >= self.thresholds[target]:
+            target += 1
+        if target == self.level and self.level > 0 and now - self._level_since >= self.min_dwell:
+            if lag < self.thresholds[self.level - 1] * self.exit_ratio:
+                target = self.level - 1
+        if target != self.level:
+            self._set_level(target, now)
+        return self.level
+
+    def record(self, kind, count=1):
+        """Count work that was shed, e.g. record("partial") or record("stale_seconds", 1.5)."""
+        self.shed_counts[kind] = self.shed_counts.get(kind, 0) + count
+
+    def _set_level(self, level, now):
+        self._time_in_level[self.level] += now - self._level_since
+        direction = "up" if level > self.level else "down"
+        self.level = level
+        self._level_since = now
+        self.transitions.append((now - self._started, self.lag, level))
+        print(f"[LOAD] {self.name}: lag {self.lag:.1f}s, shedding {direction} to level {level} ({LEVEL_NAMES[level]})")
+
+    def report(self):
+        """Human-readable summary of when and how much was shed."""
+        now = self.clock()
+        time_in_level = list(self._time_in_level)
+        time_in_level[self.level] += now - self._level_since
+        lines = [f"[LOAD] {self.name}: max lag {self.max_lag:.1f}s, {len(self.transitions)} level change(s)"]
+        for level, seconds in enumerate(time_in_level):
+            if seconds > 0:
+                lines.append(f"  level {level} ({LEVEL_NAMES[level]}): {seconds:.1f}s")
+        for kind, count in sorted(self.shed_counts.items()):
+            lines.append(f"  shed {kind}: {count:g}")
+        return "\n".join(lines)
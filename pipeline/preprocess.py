@@ -0,0 +1,157 @@
+"""
+Background preparation of upcoming playlist items
+"""
+import os
+import threading
+import time
+
+from config import CHUNK_DURATION, SAMPLERATE, PRELOAD_SECONDS
+from audio.audio_file_capture import AudioFileCapture
+from pipeline.segments import is_translated
+
+
+def translate_into(translator, store, segment):
+    if is_translated(segment.en):
+        return  # a player queued it again and it was done meanwhile
+    store.set_translation(segment, translator.translate(segment.jp))
+
+
+class Preprocessor:
+    """Single low-priority worker that gets upcoming videos ready to play.
+
+    For each wanted item it extracts the audio into the shared cache, then
+    recognizes the first `seconds` into the item's SegmentStore and queues
+    their translations as background jobs. A player that starts the item
+    later finds that range covered and its lines translated, so subtitles
+    show at once while its own pipeline carries on from where this stopped.
+
+    Decoding only happens while a decode slot is free and the governor
+    reports smooth playback, so playing streams never wait on background
+    work. The worker thread, its ffmpeg and any ASR process run at
+    background priority.
+    """
+
+    def __init__(self, hub, seconds=PRELOAD_SECONDS):
+        self.hub = hub
+        self.seconds = seconds
+        self._cond = threading.Condition()
+        self._wanted = {}  # owner -> upcoming media paths, in play order
+        self._done = set()
+        self._current = None
+        self._cancelled = False
+        self._running = True
+        self._thread = threading.Thread(target=self._worker_loop, name="preprocess", daemon=True)
+        self._thread.start()
+
+    def schedule(self, owner, media_paths):
+        """Replace the upcoming items of owner (e.g. one player's playlist)."""
+        with self._cond:
+            self._wanted[owner] = [os.path.abspath(p) for p in media_paths]
+            self._cond.notify()
+
+    def claim(self, media_path):
+        """A player is starting media_path; leave the rest of it to that player."""
+        media_path = os.path.abspath(media_path)
+        with self._cond:
+            self._done.add(media_path)
+            if self._current == media_path:
+                self._cancelled = True
+
+    def shutdown(self):
+        with self._cond:
+            self._running = False
+            self._cancelled = True
+            self._cond.notify_all()
+
+    def _next_item(self):
+        with self._cond:
+            while self._running:
+                for paths in self._wanted.values():
+                    for path in paths:
+                        if path not in self._done:
+                            self._current = path
+                            self._cancelled = False
+                            return path
+                self._cond.wait()
+            return None
+
+    def _should_stop(self, media_path):
+        with self._cond:
+            return self._cancelled or not any(media_path in paths for paths in self._wanted.values())
+
+    def _worker_loop(self):
+        self.hub.governor.apply("background")
+        while True:
+            media_path = self._next_item()
+            if media_path is None:
+                return
+            try:
+                finished = self._prepare(media_path)
+            except Exception as e:
+                print(f"[ERROR] Preparing {media_path} failed: {e}")
+                finished = True  # don't retry it in a loop
+            with self._cond:
+                # Cancelled items stay eligible: unwanted ones are skipped until
+                # scheduled again, claimed ones are already done
+                if finished:
+                    self._done.add(media_path)
+                self._current = None
+
+    def _prepare(self, media_path):
+        """Returns True once the item is prepared, False if it was cancelled first."""
+        audio_file = self.hub.extract_audio(media_path, "background")
+        if self._should_stop(media_path):
+            return False
+        print(f"[INFO] Preparing {os.path.basename(media_path)} in the background")
+        self.hub.reuse_transcripts(media_path, audio_file)
+        store = self.hub.segment_store(media_path)
+        capture = AudioFileCapture(audio_file, chunk_duration=CHUNK_DURATION, samplerate=SAMPLERATE)
+        asr = self.hub.create_asr("background")
+        origin = floor = 0.0
+        try:
+            while capture.tell() < self.seconds:
+                chunk_start = capture.tell()
+                resume = store.covered_until(chunk_start)
+                if resume > chunk_start:
+                    floor = self._add(store, asr.flush(), origin, floor, chunk_start)
+                    asr.reset()
+                    origin = floor = resume
+                    capture.seek(resume)
+                    continue
+
+                # Wait for smooth playback and a slot the playing streams aren't using
+                while not (self.hub.governor.wait_background(0.5)
+                           and self.hub.decode_slots.acquire(blocking=False)):
+                    if self._should_stop(media_path):
+                        return False
+                    time.sleep(0.1)
+                try:
+                    if self._should_stop(media_path):
+                        return False
+                    chunk = capture.get_chunk()
+                    if chunk is None:
+                        break
+                    result = asr.recognize_timed(chunk)
+                finally:
+                    self.hub.decode_slots.release()
+                floor = self._add(store, result, origin, floor, capture.tell())
+                store.mark_processed(chunk_start, capture.tell())
+            print(f"[INFO] Prepared {os.path.basename(media_path)} ({len(store)} lines)")
+            return True
+        finally:
+            try:
+                # Also when cancelled: the fed audio is already marked processed
+                self._add(store, asr.flush(), origin, floor, capture.tell())
+            finally:
+                self.hub.save_transcript(media_path)
+                if hasattr(asr, "close"):
+                    asr.close()
+
+    def _add(self, store, result, origin, floor, chunk_end):
+        segment, floor = store.add_timed(result, origin, floor, chunk_end)
+        if segment and self.hub.translation_scheduler:
+            self.hub.translation_scheduler.submit(
+                segment.start, translate_into, self.hub.translator, store, segment,
+                playhead_fn=store.playhead,
+            )
+        return floor
@@ -1,50 +1,29 @@
 import sys
 import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-import time
-import threading
 import queue
-from holoyomi.ui.subtitle_window import SubtitleWindow
-from holoyomi.asr.jp_asr import JapaneseASR
-from holoyomi.audio.audio_capture import AudioCapture
-
-# Placeholder classes
-# class AudioCapture:
-#     def get_chunk(self):
-#         time.sleep(1)
-#         return b"dummy_audio"
-
-# class Translator:
-#     def translate(self, text):
-#         return f"EN: {text}"
+from config import ASR_MODEL_PATH, USE_TRANSLATION
+from ui.subtitle_window import SubtitleWindow
+from service.client import connect
 
 def run_pipeline():
-    audio = AudioCapture()
-    asr = JapaneseASR(
-        model_path="models/vosk-ja/vosk-model-small-ja-0.22"
-    )
     window = SubtitleWindow()
-
-    running = threading.Event()
-    running.set()
-
     text_queue = queue.Queue()
-    last_text = ""
-    last_update = 0
 
-    def processing_loop():
-        while running.is_set():
-            try:
-                audio_chunk = audio.get_chunk()
-                text = asr.recognize(audio_chunk)
-                if text and text.strip() and text != last_text and time.time() - last_update > 1.0:
-                    text_queue.put(text)
-                    last_text = text
-                    last_update = time.time()
-            except Exception as e:
-                text_queue.put("Error in processing")
-            time.sleep(0.5)
+    # A running service already has the model and translator loaded
+    client = connect()
+    if client is not None:
+        print("[INFO] Attached to the Holoyomi service")
+        client.start_live(text_queue.put)
+    else:
+        from asr.jp_asr import JapaneseASR
+        from pipeline.live import LiveSession
+        translator = None
+        if USE_TRANSLATION:
+            from translate.jp_to_en import JPToENTranslator
+            translator = JPToENTranslator()
+        live = LiveSession(JapaneseASR(model_path=ASR_MODEL_PATH), translator, text_queue.put).start()
 
     def ui_update_loop():
         try:
@@ -54,15 +33,16 @@ def run_pipeline():
         finally:
             window.root.after(100, ui_update_loop)
 
-    processor = threading.Thread(target=processing_loop, daemon=True)
-    processor.start()
-
     window.root.after(100, ui_update_loop)
 
     try:
         window.run()
     finally:
-        running.clear()
+        if client is not None:
+            client.stop_live()  # the service prints the load shedding report
+            client.shutdown()
+        else:
+            print(live.stop())
 
 if __name__ == "__main__":
     run_pipeline()
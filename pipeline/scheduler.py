@@ -0,0 +1,105 @@
+"""
+Deadline-aware worker pool for ASR/translation jobs around the playhead
+"""
+import itertools
+import threading
+
+
+class DeadlineScheduler:
+    """Worker pool that always runs the pending job closest to the playhead.
+
+    Every job carries the media timestamp (seconds) it will be needed at.
+    Because the playhead keeps moving, priority is recomputed against
+    playhead_fn() each time a worker picks a job instead of being fixed at
+    submit time. Jobs inside the window [playhead - grace, playhead + lookahead]
+    go first, nearest first; everything else waits until the window is empty.
+
+    A pool shared by several players takes each job's own playhead_fn, so
+    every stream's next line competes on its own clock. Jobs more than
+    expire_after seconds behind their playhead are dropped unrun, so the
+    queue stays bounded when work can't keep up with playback; MediaSession
+    queues such lines again once they are back in its window.
+
+    A playhead_fn returning None marks a stream that isn't playing (e.g. a
+    playlist item being prepared in the background): its jobs run only when
+    no playing stream has work, earliest first, and never expire.
+    """
+
+    def __init__(self, playhead_fn=None, lookahead=60.0, grace=2.0, num_workers=2, name="scheduler",
+                 expire_after=None):
+        self.playhead_fn = playhead_fn
+        self.lookahead = lookahead
+        self.grace = grace
+        self.expire_after = expire_after
+        self.expired = 0
+        self._cond = threading.Condition()
+        self._jobs = []  # (timestamp, seq, playhead_fn, fn, args)
+        self._seq = itertools.count()
+        self._running = True
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"{name}-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, timestamp, fn, *args, playhead_fn=None):
+        playhead_fn = playhead_fn or self.playhead_fn
+        with self._cond:
+            self._jobs.append((timestamp, next(self._seq), playhead_fn, fn, args))
+            self._cond.notify()
+
+    def pending(self):
+        with self._cond:
+            return len(self._jobs)
+
+    def shutdown(self):
+        with self._cond:
+            self._running = False
+            self._jobs.clear()
+            self._cond.notify_all()
+
+    def _distance(self, job):
+        """Seconds from the job's playhead to its timestamp, None if not playing."""
+        playhead = job[2]() if job[2] else 0.0
+        return None if playhead is None else job[0] - playhead
+
+    def _priority(self, job):
+        distance = self._distance(job)
+        if distance is None:
+            return (True, True, job[0], job[1])
+        outside = not (-self.grace <= distance <= self.lookahead)
+        return (False, outside, abs(distance), job[1])
+
+    def _expired(self, job):
+        distance = self._distance(job)
+        return distance is not None and distance < -self.expire_after
+
+    def _take_job(self):
+        # A linear scan is fine here: the queue holds at most a few hundred
+        # lines, and a heap keyed at submit time would go stale as playback moves.
+        with self._cond:
+            while True:
+                while self._running and not self._jobs:
+                    self._cond.wait()
+                if not self._running:
+                    return None
+                if self.expire_after is not None:
+                    kept = [job for job in self._jobs if not self._expired(job)]
+                    self.expired += len(self._jobs) - len(kept)
+                    self._jobs = kept
+                if self._jobs:
+                    break
+            best = min(range(len(self._jobs)), key=lambda i: self._priority(self._jobs[i]))
+            return self._jobs.pop(best)
+
+    def _worker_loop(self):
+        while True:
+            job = self._take_job()
+            if job is None:
+                return
+            _, _, _, fn, args = job
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"[ERROR] Scheduled job failed: {e}")
@@ -0,0 +1,200 @@
+"""
+Timestamped transcript segments and the audio ranges already recognized
+"""
+import bisect
+import threading
+
+from pipeline.timeline import TranscriptTimeline, is_translated
+
+
+class Segment:
+    """One recognized line; times are seconds into the media."""
+    __slots__ = ("id", "start", "end", "jp", "en")
+
+    def __init__(self, start, end, jp, en=""):
+        self.id = None
+        self.start = start
+        self.end = end
+        self.jp = jp
+        self.en = en
+
+    def display_text(self):
+        return f"{self.jp}\n{self.en}" if self.en else self.jp
+
+
+class SegmentStore:
+    """Thread-safe store of recognized segments, kept in a searchable TranscriptTimeline.
+
+    Alongside the segments it keeps the audio ranges that have already been
+    fed through the recognizer, so after a seek the pipeline can skip work it
+    has done before and only decode what is missing.
+
+    playhead_fn is set by the player currently showing this media; while
+    nobody is, playhead() returns None and its translation jobs count as
+    background work.
+
+    Listeners added with subscribe() are called as listener(kind, segment),
+    kind being "segment" or "translation", after the store is updated and
+    on the updating thread.
+    """
+
+    def __init__(self):
+        self.playhead_fn = None
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._timeline = TranscriptTimeline()
+        # Sorted, non-overlapping processed ranges as parallel start/end lists
+        self._covered_starts = []
+        self._covered_ends = []
+
+    def __len__(self):
+        return len(self._timeline)
+
+    def subscribe(self, listener):
+        self._listeners = self._listeners + [listener]
+
+    def unsubscribe(self, listener):
+        self._listeners = [fn for fn in self._listeners if fn != listener]  # bound methods are equal, not identical
+
+    def _notify(self, kind, segment):
+        for listener in self._listeners:
+            listener(kind, segment)
+
+    def add(self, start, end, jp):
+        with self._lock:
+            segment = self._timeline.add(Segment(start, end, jp))
+        self._notify("segment", segment)
+        return segment
+
+    def add_timed(self, result, origin, floor, chunk_end):
+        """Store a recognizer result as a media-timed segment.
+
+        result is recognize_timed()/flush() output, timed relative to the
+        recognizer's last reset at media offset origin; without word timings
+        the line spans floor..chunk_end. Returns (segment or None, new floor).
+        """
+        jp_text, start, end = result
+        jp_text = jp_text.strip()
+        if not jp_text:
+            return None, floor
+        if start is None:
+            start, end = floor, chunk_end
+        else:
+            start, end = origin + start, origin + end
+        return self.add(start, end, jp_text), end
+
+    def playhead(self):
+        playhead_fn = self.playhead_fn
+        return playhead_fn() if playhead_fn else None
+
+    def set_translation(self, segment, en):
+        with self._lock:
+            self._timeline.set_translation(segment, en)
+        self._notify("translation", segment)
+
+    def segment_at(self, t, hold=0.0):
+        """Return the segment being spoken at t (or within hold seconds after it)."""
+        with self._lock:
+            return self._timeline.segment_at(t, hold)
+
+    def search(self, query, limit=100):
+        """Segments whose JP or EN text contains the query, in time order."""
+        with self._lock:
+            return self._timeline.search(query, limit)
+
+    def mark_processed(self, start, end):
+        """Record that audio in [start, end) has been recognized."""
+        if end <= start:
+            return
+        with self._lock:
+            i = bisect.bisect_left(self._covered_ends, start)
+            j = bisect.bisect_right(self._covered_starts, end)
+            if i < j:
+                start = min(start, self._covered_starts[i])
+                end = max(end, self._covered_ends[j - 1])
+            self._covered_starts[i:j] = [start]
+            self._covered_ends[i:j] = [end]
+
+    def segments_between(self, start, end):
+        """Segments starting in [start, end), in time order."""
+        with self._lock:
+            return self._timeline.between(start, end)
+
+    def gaps(self, start, end):
+        """Sub-ranges of [start, end) that have not been processed yet."""
+        with self._lock:
+            gaps = []
+            i = bisect.bisect_right(self._covered_ends, start)
+            while start < end:
+                if i == len(self._covered_starts) or self._covered_starts[i] >= end:
+                    gaps.append((start, end))
+                    break
+                if self._covered_starts[i] > start:
+                    gaps.append((start, self._covered_starts[i]))
+                start = self._covered_ends[i]
+                i += 1
+            return gaps
+
+    def reuse(self, other, offset, start, end):
+        """Copy other's lines for [start, end) here, where our time t is other's t + offset.
+
+        Only ranges other has processed and we haven't are taken; they are
+        marked processed here. Lines cut by a range's edges are not copied,
+        and their audio is left unprocessed for the recognizer. Failed
+        translations are not copied. Returns the copied segments.
+        """
+        copied = []
+        for ref_start, ref_end in other.covered_between(start + offset, end + offset):
+            for gap_start, gap_end in self.gaps(ref_start - offset, ref_end - offset):
+                head = other.segment_at(gap_start + offset)
+                if head is not None and head.start < gap_start + offset:
+                    gap_start = head.end - offset
+                for segment in other.segments_between(gap_start + offset, gap_end + offset):
+                    if segment.end - offset > gap_end:
+                        gap_end = segment.start - offset
+                        break
+                    copy = self.add(segment.start - offset, segment.end - offset, segment.jp)
+                    if is_translated(segment.en):
+                        self.set_translation(copy, segment.en)
+                    copied.append(copy)
+                self.mark_processed(gap_start, gap_end)
+        return copied
+
+    def covered_between(self, start, end):
+        """Processed ranges clipped to [start, end)."""
+        with self._lock:
+            i = bisect.bisect_right(self._covered_ends, start)
+            ranges = []
+            while i < len(self._covered_starts) and self._covered_starts[i] < end:
+                ranges.append((max(start, self._covered_starts[i]), min(end, self._covered_ends[i])))
+                i += 1
+            return ranges
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "segments": [
+                    [s.start, s.end, s.jp, s.en if is_translated(s.en) else ""]
+                    for s in self._timeline.between(float("-inf"), float("inf"))
+                ],
+                "covered": [list(r) for r in zip(self._covered_starts, self._covered_ends)],
+            }
+
+    @classmethod
+    def from_dict(cls, data):
+        store = cls()
+        for start, end, jp, en in data.get("segments", []):
+            segment = store.add(start, end, jp)
+            if is_translated(en):
+                store.set_translation(segment, en)
+        for start, end in data.get("covered", []):
+            store.mark_processed(start, end)
+        return store
+
+    def covered_until(self, t):
+        """Return the end of the processed range containing t, or t if it is unprocessed."""
+        with self._lock:
+            i = bisect.bisect_right(self._covered_starts, t) - 1
+            if i >= 0 and t < self._covered_ends[i]:
+                return self._covered_ends[i]
+            return t
@@ -0,0 +1,217 @@
+"""
+Recognition and translation of one media file around a moving playhead
+"""
+import threading
+import time
+
+from config import (
+    CHUNK_DURATION, SAMPLERATE, LOOKAHEAD_SECONDS, THROTTLED_LOOKAHEAD_SECONDS, LOAD_SHED_THRESHOLDS,
+    LOAD_SHED_EXIT_RATIO, LOAD_SHED_MIN_DWELL, FILLER_MAX_CHARS,
+)
+from asr.asr_worker import ASRWorkerError
+from audio.audio_file_capture import AudioFileCapture
+from pipeline.chunk_control import ChunkController
+from pipeline.load_shedding import LoadShedder, is_filler
+from pipeline.segments import is_translated
+
+
+class MediaSession:
+    """Pipeline for one playing file: Audio -> ASR -> Translation -> Segment store
+
+    playhead_fn() gives the viewer's position in seconds; recognition stays
+    up to LOOKAHEAD_SECONDS ahead of it and restarts after seek(). The store
+    is the hub's one for the file, so ranges recognized before (earlier
+    seeks, the preprocessor, reused transcripts) are skipped. Runs on its
+    own thread until stop(); used in-process by the player and by the
+    service for its clients.
+    """
+
+    def __init__(self, hub, media_path, playhead_fn, name="player"):
+        self.hub = hub
+        self.media_path = media_path
+        self.playhead = playhead_fn
+        self.store = hub.segment_store(media_path)
+        self.load_shedder = LoadShedder(
+            LOAD_SHED_THRESHOLDS, LOAD_SHED_EXIT_RATIO, LOAD_SHED_MIN_DWELL, name=name
+        )
+        self.processing_done = threading.Event()
+        self._seek_target = 0.0
+        self._window_end = 0.0  # lines before this were checked for missing translations
+        self._seek_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.hub.preprocessor.claim(self.media_path)
+        self.store.playhead_fn = self.playhead
+        self._thread = threading.Thread(target=self.run, name="pipeline", daemon=True)
+        self._thread.start()
+        return self
+
+    def seek(self, seconds):
+        """Restart recognition at a new playhead (thread-safe)"""
+        self._seek_target = seconds
+        self._seek_event.set()
+
+    def stop(self):
+        """Stop recognizing; queued translations for this file become background work."""
+        if self.store.playhead_fn is self.playhead:
+            self.store.playhead_fn = None
+        self._stop_event.set()
+        self._seek_event.set()
+
+    def run(self):
+        store = self.store
+        asr = None
+        try:
+            # Recognition for the playing video outranks background work but
+            # stays off the cores left to VLC
+            self.hub.governor.apply("asr")
+            # Decoded audio lives in the shared cache, not next to the video
+            try:
+                audio_file = self.hub.extract_audio(self.media_path)
+            except Exception as e:
+                print(f"[ERROR] Could not extract audio: {e}")
+                audio_file = self.media_path
+            print(f"[INFO] Starting pipeline with {audio_file}")
+            # Lines from re-uploads/clips of this audio land in the store as
+            # covered ranges, which the loop below then skips
+            self.hub.reuse_transcripts_async(self.media_path, audio_file)
+            chunker = ChunkController.from_preset(self.hub.chunk_preset, CHUNK_DURATION)
+            audio_capture = AudioFileCapture(audio_file, chunk_duration=chunker.duration, samplerate=SAMPLERATE)
+            asr = self.hub.acquire_asr()
+            print("[INFO] ASR initialized")
+
+            origin = 0.0  # media offset of the recognizer's last reset
+            floor = 0.0   # end of the last emitted segment
+            while not self._stop_event.is_set():
+                if self._seek_event.is_set():
+                    # Finish the in-flight utterance (its audio is already
+                    # marked processed) and resume at the first audio after
+                    # the new playhead that hasn't been recognized
+                    self._seek_event.clear()
+                    self.processing_done.clear()
+                    target = self._seek_target
+                    self._emit_segment(asr.flush(), origin, floor, audio_capture.tell())
+                    self._window_end = float("-inf")
+                    origin = floor = store.covered_until(target)
+                    asr.reset()
+                    audio_capture.seek(origin)
+                    print(f"[INFO] Seek to {target:.1f}s, recognizing from {origin:.1f}s")
+
+                chunk_start = audio_capture.tell()
+                playhead = self.playhead()
+                self._retry_translations(playhead)
+                lag = max(0.0, playhead - chunk_start)
+                self.load_shedder.update(lag)
+                if self.load_shedder.drop_stale and lag >= LOAD_SHED_THRESHOLDS[0]:
+                    # Fell far behind playback: lines for this audio would never
+                    # be shown, so continue from the playhead instead
+                    self.load_shedder.record("stale audio seconds", lag)
+                    self._seek_target = playhead
+                    self._seek_event.set()
+                    continue
+                lookahead = THROTTLED_LOOKAHEAD_SECONDS if self.hub.governor.throttled else LOOKAHEAD_SECONDS
+                if chunk_start > playhead + lookahead:
+                    # Far enough ahead (less so while playback stutters); idle
+                    # until playback catches up or a seek
+                    self._seek_event.wait(0.25)
+                    continue
+
+                resume = store.covered_until(chunk_start)
+                if resume > chunk_start:
+                    # Reached audio recognized earlier (before a seek, or in the
+                    # background while this video was queued): reuse it
+                    self._emit_segment(asr.flush(), origin, floor, chunk_start)
+                    asr.reset()
+                    origin = floor = resume
+                    audio_capture.seek(resume)
+                    continue
+
+                chunk = audio_capture.get_chunk()
+                if chunk is None:
+                    self._emit_segment(asr.flush(), origin, floor, chunk_start)
+                    print("[INFO] Pipeline finished")
+                    print(self.load_shedder.report())
+                    self.hub.save_transcript(self.media_path)
+                    self.processing_done.set()
+                    self._seek_event.wait()
+                    continue
+
+                try:
+                    chunk_end = audio_capture.tell()
+                    with self.hub.decode_slots:
+                        decode_started = time.perf_counter()
+                        result = asr.recognize_timed(chunk)
+                        decode_seconds = time.perf_counter() - decode_started
+                    audio_capture.set_chunk_duration(
+                        chunker.observe(chunk_end - chunk_start, decode_seconds, lag)
+                    )
+                    floor = self._emit_segment(result, origin, floor, chunk_end)
+                    store.mark_processed(chunk_start, chunk_end)
+                except ASRWorkerError as e:
+                    # The utterance in flight is lost; carry on from this chunk
+                    print(f"[ERROR] {e}; starting a new recognizer")
+                    asr = self.hub.create_asr()
+                    origin = floor = chunk_start
+                    audio_capture.seek(chunk_start)
+                except Exception as e:
+                    print(f"[ERROR] Pipeline error: {e}")
+            # Another video was loaded
+            self.hub.save_transcript(self.media_path)
+
+        except Exception as e:
+            print(f"[FATAL] Pipeline failed to start: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            if asr is not None:
+                self.hub.release_asr(asr)
+
+    def _emit_segment(self, result, origin, floor, chunk_end):
+        """Store a recognizer result as a media-timed segment; returns the new floor"""
+        segment, end = self.store.add_timed(result, origin, floor, chunk_end)
+        if segment is None:
+            return floor
+        jp_text = segment.jp
+        print(f"[ASR] {jp_text}")
+
+        self._queue_translation(segment)
+        return end
+
+    def _queue_translation(self, segment):
+        """Translate if enabled, nearest-to-playhead lines first"""
+        if not self.hub.translation_scheduler:
+            return
+        if self.load_shedder.jp_only:
+            self.load_shedder.record("translations (JP only)")
+        elif self.load_shedder.skip_filler_translation and is_filler(segment.jp, FILLER_MAX_CHARS):
+            self.load_shedder.record("filler translations")
+        else:
+            self.hub.translation_scheduler.submit(
+                segment.start, self._translate_segment, segment, playhead_fn=self.store.playhead
+            )
+
+    def _retry_translations(self, playhead):
+        """Queue untranslated lines as they enter the translation window.
+
+        Their jobs expired while the playhead was far away, failed, or were
+        shed; a seek rewinds the window so lines seen before get another try.
+        """
+        if not self.hub.translation_scheduler:
+            return
+        start = max(self._window_end, playhead - self.hub.translation_scheduler.grace)
+        end = playhead + LOOKAHEAD_SECONDS
+        if end <= start:
+            return
+        self._window_end = end
+        for segment in self.store.segments_between(start, end):
+            if not is_translated(segment.en):
+                self._queue_translation(segment)
+
+    def _translate_segment(self, segment):
+        if is_translated(segment.en):
+            return  # queued again by a retry and done meanwhile
+        en_text = self.hub.translator.translate(segment.jp)
+        print(f"[EN] {en_text}")
+        self.store.set_translation(segment, en_text)
@@ -0,0 +1,164 @@
+"""
+Array-backed transcript timeline with an inverted index over JP and EN text
+"""
+import bisect
+import re
+from array import array
+
+_EN_WORD = re.compile(r"[a-z0-9']+")
+# Hiragana, katakana (incl. ー), CJK ideographs and half-width katakana
+_JP_RUN = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uf900-\ufaff\uff66-\uff9f]+")
+
+
+def _jp_runs(text):
+    # Vosk separates Japanese words with spaces; search ignores them
+    return _JP_RUN.findall(text.replace(" ", ""))
+
+
+def is_translated(en):
+    """False for "" and for the "[Translation Timeout]"-style messages shown in place of EN."""
+    return bool(en) and not (en.startswith("[") and en.endswith("]"))
+
+
+def index_tokens(text):
+    """Tokens stored for a line: EN words plus JP character unigrams and bigrams."""
+    text = text.lower()
+    tokens = set(_EN_WORD.findall(text))
+    for run in _jp_runs(text):
+        tokens.update(run)
+        tokens.update(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def query_tokens(text):
+    """Tokens a line must contain to match: EN words, JP bigrams (unigram for 1-char runs)."""
+    text = text.lower()
+    tokens = set(_EN_WORD.findall(text))
+    for run in _jp_runs(text):
+        if len(run) > 1:
+            tokens.update(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.add(run)
+    return tokens
+
+
+class TranscriptTimeline:
+    """Every recognized segment of a session, searchable by time and by text.
+
+    Start times live in an array('d') kept in time order next to an array('I')
+    of segment ids, so finding the line at a time is one bisect. Each token maps
+    to a sorted array('I') of segment ids; a query walks the rarest of its
+    posting lists block by block and keeps the ids found in every other list
+    over the block's id range. Not thread-safe on its own; SegmentStore
+    serialises access.
+    """
+
+    def __init__(self):
+        self._segments = []        # by id
+        self._starts = array("d")  # time order
+        self._order = array("I")   # segment id at each time-ordered slot
+        self._postings = {}        # token -> sorted array("I") of ids
+        self._compact = []         # by id: JP + EN lower-cased without spaces, for runs > 2 chars
+
+    def __len__(self):
+        return len(self._segments)
+
+    def add(self, segment):
+        segment.id = len(self._segments)
+        self._segments.append(segment)
+        self._compact.append(segment.jp.lower().replace(" ", ""))
+        i = bisect.bisect_right(self._starts, segment.start)
+        self._starts.insert(i, segment.start)
+        self._order.insert(i, segment.id)
+        self._index(segment.id, segment.jp)
+        return segment
+
+    def set_translation(self, segment, en):
+        segment.en = en
+        if not is_translated(en):
+            return  # an error message, replaced once a retry succeeds
+        self._compact[segment.id] = (segment.jp + en).lower().replace(" ", "")
+        self._index(segment.id, en)
+
+    def _index(self, segment_id, text):
+        for token in index_tokens(text):
+            ids = self._postings.get(token)
+            if ids is None:
+                self._postings[token] = array("I", [segment_id])
+                continue
+            i = bisect.bisect_left(ids, segment_id)
+            if i == len(ids) or ids[i] != segment_id:
+                ids.insert(i, segment_id)
+
+    def segment_at(self, t, hold=0.0):
+        i = bisect.bisect_right(self._starts, t) - 1
+        if i < 0:
+            return None
+        segment = self._segments[self._order[i]]
+        return segment if t < segment.end + hold else None
+
+    def between(self, start, end):
+        """Segments starting in [start, end), in time order."""
+        lo = bisect.bisect_left(self._starts, start)
+        hi = bisect.bisect_left(self._starts, end)
+        return [self._segments[i] for i in self._order[lo:hi]]
+
+    def search(self, query, limit=100):
+        """Segments matching every query word, in time order.
+
+        Returns at most `limit` hits: the first lines recognized that match,
+        not necessarily the earliest in the media. Ask for one more than you
+        show to tell whether the list was cut.
+        """
+        tokens = query_tokens(query)
+        if not tokens:
+            return []
+        postings = []
+        for token in tokens:
+            ids = self._postings.get(token)
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+
+        # Intersect block by block of the rarest list: each other list is cut
+        # to the block's id range by bisect and scattered into a mask over
+        # that range, which the block's ids are then filtered through, so the
+        # per-id work is a couple of numpy passes. EN words and JP runs of up to two characters are tokens, so this
+        # is exact for them; longer runs also need their bigrams adjacent,
+        # which the compact text confirms. Ids follow recognition order, so
+        # stopping at `limit` keeps lookups bounded however common the query
+        # is. Blocks are sized from the hit rate so far. numpy is imported
+        # here so attaching to the service doesn't load it.
+        import numpy as np
+        long_runs = [run for run in _jp_runs(query.lower()) if len(run) > 2]
+        first, rest = postings[0], postings[1:]
+        hits = []
+        lo, block = 0, max(64, limit)
+        while lo < len(first) and len(hits) < limit:
+            ids = np.frombuffer(first[lo:lo + block], dtype=np.uintc).astype(np.intp)
+            lo += block
+            base, top = int(ids[0]), int(ids[-1])
+            ids -= base
+            for other in rest:
+                part = np.frombuffer(
+                    other[bisect.bisect_left(other, base):bisect.bisect_right(other, top)], dtype=np.uintc
+                ).astype(np.intp)
+                present = np.zeros(top - base + 1, dtype=bool)
+                present[part - base] = True
+                ids = ids[present[ids]]
+                if not len(ids):
+                    break
+            for segment_id in (ids + base).tolist():
+                if long_runs:
+                    compact = self._compact[segment_id]
+                    if not all(run in compact for run in long_runs):
+                        continue
+                hits.append(self._segments[segment_id])
+                if len(hits) >= limit:
+                    break
+            # Enough ids for the missing hits at the rate seen so far (x1.25),
+            # growing at most 4x while few hits make the rate unreliable
+            block = min(4 * block, max(64, int((limit - len(hits)) * 1.25 * lo / max(1, len(hits)))))
+        hits.sort(key=lambda s: s.start)
+        return hits
@@ -0,0 +1,262 @@
+"""
+Client side of the resident service: the same surface as StreamHub/MediaSession
+"""
+import itertools
+import os
+import socket
+import threading
+
+from config import USE_SERVICE, SERVICE_SOCKET, SERVICE_CONNECT_TIMEOUT, CHUNK_PRESET
+from pipeline.segments import SegmentStore
+from service.protocol import encode, decode
+
+
+def connect(socket_path=SERVICE_SOCKET, timeout=SERVICE_CONNECT_TIMEOUT, chunk_preset=CHUNK_PRESET):
+    """A ServiceClient when the service is running, else None (run in-process).
+
+    chunk_preset applies if the service goes away and the client carries on
+    with an in-process pipeline.
+    """
+    if not USE_SERVICE or not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        reader = sock.makefile("rb")
+        hello = decode(reader.readline())
+        if hello.get("event") != "hello":
+            raise ValueError(f"unexpected greeting {hello}")
+        sock.settimeout(None)
+    except (OSError, ValueError) as e:
+        print(f"[INFO] Service at {socket_path} not answering ({e}); running in-process")
+        sock.close()
+        return None
+    return ServiceClient(sock, reader, chunk_preset)
+
+
+class RemoteSession:
+    """MediaSession stand-in whose pipeline runs in the service.
+
+    The service streams the session's lines into a local SegmentStore, so the
+    player reads store, seek() and stop() exactly as with a local session.
+    The playhead is pushed from a small thread whenever it moves. If the
+    service goes away, fail_over() continues the session in a local hub
+    with the same store.
+    """
+
+    PLAYHEAD_INTERVAL = 0.2  # s
+
+    def __init__(self, client, sid, media_path, playhead_fn):
+        self.client = client
+        self.sid = sid
+        self.media_path = media_path
+        self.playhead = playhead_fn
+        self.store = SegmentStore()
+        self._segments = {}  # service segment id -> local Segment
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._local = None  # in-process MediaSession after fail_over()
+
+    def start(self):
+        self.client.send({
+            "op": "open", "session": self.sid,
+            "media": os.path.abspath(self.media_path), "playhead": self.playhead(),
+        })
+        threading.Thread(target=self._push_playhead, name="playhead", daemon=True).start()
+        return self
+
+    def seek(self, seconds):
+        with self._lock:
+            local = self._local
+        if local is not None:
+            local.seek(seconds)
+        else:
+            self.client.send({"op": "seek", "session": self.sid, "seconds": seconds})
+
+    def stop(self):
+        with self._lock:
+            self._stop_event.set()
+            local = self._local
+        if local is not None:
+            local.stop()
+        else:
+            self.client.send({"op": "close", "session": self.sid})
+        self.client.forget_session(self.sid)
+
+    def fail_over(self, hub):
+        """Continue in hub: lines received so far are kept, the rest is recognized locally."""
+        with self._lock:
+            if self._stop_event.is_set():
+                return
+            self._stop_event.set()  # ends the playhead pushes
+            hub.adopt_store(self.media_path, self.store)
+            self._local = hub.open_session(self.media_path, self.playhead)
+            self._local.seek(self.playhead())
+
+    def _push_playhead(self):
+        last = None
+        while not self._stop_event.wait(self.PLAYHEAD_INTERVAL):
+            if self.client.lost:
+                return
+            seconds = self.playhead()
+            if seconds != last:
+                self.client.send({"op": "playhead", "session": self.sid, "seconds": seconds})
+                last = seconds
+
+    def on_event(self, event):
+        if event["event"] == "segment":
+            if event["id"] in self._segments:
+                return  # already in the snapshot sent on open
+            segment = self.store.add(event["start"], event["end"], event["jp"])
+            # Recognized audio, so a local pipeline after fail_over() skips it
+            self.store.mark_processed(event["start"], event["end"])
+            self._segments[event["id"]] = segment
+            if event.get("en"):
+                self.store.set_translation(segment, event["en"])
+        elif event["event"] == "translation":
+            segment = self._segments.get(event["id"])
+            if segment is not None:
+                self.store.set_translation(segment, event["en"])
+
+
+class ServiceClient:
+    """Connection to the service, used by players in place of a StreamHub.
+
+    When the connection drops (the service stopped or crashed) the client
+    loads the pipeline in-process once and moves every open session, the
+    upcoming items and live recognition over to it; players keep their
+    session objects and stores.
+    """
+
+    def __init__(self, sock, reader, chunk_preset=CHUNK_PRESET):
+        self.sock = sock
+        self.chunk_preset = chunk_preset
+        self.lost = False  # the connection is gone; calls go to self._hub
+        self._reader = reader
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._sessions = {}  # session id -> RemoteSession
+        self._upcoming = {}  # owner -> media paths, rescheduled after a fail-over
+        self._on_text = None
+        self._live = None
+        self._hub = None
+        self._hub_ready = threading.Event()
+        self._closing = False
+        threading.Thread(target=self._read_loop, name="service-reader", daemon=True).start()
+
+    def send(self, message):
+        if self.lost:
+            return
+        with self._send_lock:
+            try:
+                self.sock.sendall(encode(message))
+            except OSError as e:
+                print(f"[ERROR] Lost the service connection: {e}")
+                self.lost = True
+                try:
+                    self.sock.shutdown(socket.SHUT_RDWR)  # ends _read_loop, which fails over
+                except OSError:
+                    pass
+
+    def open_session(self, media_path, playhead_fn, name="player"):
+        if self.lost:
+            self._hub_ready.wait()
+        if self._hub is not None:
+            return self._hub.open_session(media_path, playhead_fn, name=name)
+        sid = next(self._ids)
+        session = RemoteSession(self, sid, media_path, playhead_fn)
+        self._sessions[sid] = session
+        return session.start()
+
+    def forget_session(self, sid):
+        self._sessions.pop(sid, None)
+
+    def schedule_upcoming(self, owner, media_paths):
+        self._upcoming[owner] = list(media_paths)
+        if self._hub is not None:
+            self._hub.schedule_upcoming(owner, media_paths)
+        else:
+            self.send({"op": "upcoming", "owner": id(owner), "media": [os.path.abspath(p) for p in media_paths]})
+
+    def report_playback(self, owner, lost, displayed):
+        if self._hub is not None:
+            self._hub.report_playback(owner, lost, displayed)
+        else:
+            self.send({"op": "playback", "owner": id(owner), "lost": lost, "displayed": displayed})
+
+    def start_live(self, on_text):
+        """Recognize the service machine's capture device; on_text(text) gets each line."""
+        self._on_text = on_text
+        if self._hub is not None:
+            self._start_local_live()
+        else:
+            self.send({"op": "live_start"})
+
+    def stop_live(self):
+        self._on_text = None
+        live, self._live = self._live, None
+        if live is not None:
+            print(live.stop())
+            self._hub.release_asr(live.asr)
+        else:
+            self.send({"op": "live_stop"})
+
+    def shutdown(self):
+        """Detach; the service keeps running (and saves transcripts itself)."""
+        self._closing = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        if self._hub is not None:
+            self._hub.shutdown()
+
+    def _fail_over(self):
+        """Carry on in-process after the service went away."""
+        self.lost = True
+        print("[ERROR] Lost the Holoyomi service; loading the pipeline in-process")
+        try:
+            from pipeline.hub import StreamHub
+            self._hub = StreamHub(chunk_preset=self.chunk_preset)
+        except Exception as e:
+            print(f"[FATAL] Could not load the pipeline in-process: {e}")
+            return
+        finally:
+            self._hub_ready.set()
+        for session in list(self._sessions.values()):
+            session.fail_over(self._hub)
+        for owner, media_paths in list(self._upcoming.items()):
+            self._hub.schedule_upcoming(owner, media_paths)
+        if self._on_text:
+            self._start_local_live()
+        print(f"[INFO] Continuing {len(self._sessions)} session(s) in-process")
+
+    def _start_local_live(self):
+        from pipeline.live import LiveSession
+        self._live = LiveSession(
+            self._hub.acquire_asr(), self._hub.translator, self._on_text,
+            chunk_preset=self._hub.chunk_preset,
+        ).start()
+
+    def _read_loop(self):
+        try:
+            for line in self._reader:
+                try:
+                    event = decode(line)
+                except ValueError:
+                    continue
+                if event.get("event") == "text":
+                    if self._on_text:
+                        self._on_text(event["text"])
+                    continue
+                session = self._sessions.get(event.get("session"))
+                if session is not None:
+                    session.on_event(event)
+        except (OSError, ValueError):
+            pass
+        if self._closing:
+            print("[INFO] Disconnected from the service")
+            return
+        self._fail_over()
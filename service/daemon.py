@@ -0,0 +1,212 @@
+"""
+Resident Holoyomi service: keeps the ASR model, recognizers and caches loaded
+
+Start it once (e.g. at login) and leave it running:
+    python -m service.daemon [--chunk-preset balanced]
+holoyomi_app.py and pipeline/runner.py attach to it over a Unix socket
+(SERVICE_SOCKET) and skip their own model/translator start-up; without it
+they run everything in-process as before.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import signal
+import socket
+import threading
+import time
+
+from config import SERVICE_SOCKET, SERVICE_ASR_POOL, CHUNK_PRESET, CHUNK_PRESETS
+from service.protocol import encode, decode, segment_event
+
+
+class ClientConnection:
+    """One attached app: its media sessions, playback reports and live session.
+
+    Sessions are identified by ids the client picks; the daemon follows the
+    playhead the client pushes for each and streams every segment and
+    translation of the session's store back as events.
+    """
+
+    def __init__(self, hub, sock):
+        self.hub = hub
+        self.sock = sock
+        self._send_lock = threading.Lock()
+        self.sessions = {}   # session id -> (MediaSession, store listener)
+        self.playheads = {}  # session id -> last pushed playhead (s)
+        self.owners = set()  # client-side players that scheduled items or reported playback
+        self.live = None
+
+    def send(self, message):
+        data = encode(message)
+        with self._send_lock:
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                pass  # client went away; serve() cleans up
+
+    def serve(self):
+        self.send({"event": "hello", "pid": os.getpid()})
+        try:
+            for line in self.sock.makefile("rb"):
+                try:
+                    message = decode(line)
+                except ValueError:
+                    continue
+                handler = getattr(self, f"op_{message.get('op')}", None)
+                if handler is None:
+                    print(f"[Service] Unknown request: {message.get('op')}")
+                    continue
+                try:
+                    handler(message)
+                except Exception as e:
+                    print(f"[Service] {message.get('op')} failed: {e}")
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    def op_open(self, message):
+        sid = message["session"]
+        self._close_session(sid)
+        self.playheads[sid] = float(message.get("playhead", 0.0))
+        session = self.hub.open_session(
+            message["media"], lambda: self.playheads.get(sid, 0.0), name=f"client {sid}"
+        )
+
+        def forward(kind, segment):
+            self.send(segment_event(sid, kind, segment))
+
+        session.store.subscribe(forward)
+        self.sessions[sid] = (session, forward)
+        # Lines already in the store (earlier viewers, preprocessing, reuse)
+        for segment in session.store.segments_between(float("-inf"), float("inf")):
+            self.send(segment_event(sid, "segment", segment))
+
+    def op_playhead(self, message):
+        self.playheads[message["session"]] = float(message["seconds"])
+
+    def op_seek(self, message):
+        sid = message["session"]
+        self.playheads[sid] = float(message["seconds"])
+        if sid in self.sessions:
+            self.sessions[sid][0].seek(float(message["seconds"]))
+
+    def op_close(self, message):
+        self._close_session(message["session"])
+
+    def op_upcoming(self, message):
+        owner = (self, message["owner"])
+        self.owners.add(owner)
+        self.hub.schedule_upcoming(owner, message.get("media", []))
+
+    def op_playback(self, message):
+        owner = (self, message["owner"])
+        self.owners.add(owner)
+        self.hub.report_playback(owner, message["lost"], message["displayed"])
+
+    def op_live_start(self, message):
+        if self.live:
+            return
+        from pipeline.live import LiveSession
+        self.live = LiveSession(
+            self.hub.acquire_asr(), self.hub.translator,
+            lambda text: self.send({"event": "text", "text": text}),
+            chunk_preset=self.hub.chunk_preset,
+        ).start()
+
+    def op_live_stop(self, message):
+        live, self.live = self.live, None
+        if live:
+            print(live.stop())
+            self.hub.release_asr(live.asr)
+
+    def _close_session(self, sid):
+        entry = self.sessions.pop(sid, None)
+        if entry:
+            session, forward = entry
+            session.store.unsubscribe(forward)
+            session.stop()
+        self.playheads.pop(sid, None)
+
+    def close(self):
+        for sid in list(self.sessions):
+            self._close_session(sid)
+        self.op_live_stop({})
+        for owner in self.owners:
+            self.hub.schedule_upcoming(owner, [])
+            self.hub.governor.forget(owner)
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def _service_running(path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def serve(socket_path=SERVICE_SOCKET, chunk_preset=CHUNK_PRESET):
+    if not hasattr(socket, "AF_UNIX"):
+        print("[ERROR] The service needs Unix sockets, which this platform lacks")
+        return 1
+    if os.path.exists(socket_path):
+        if _service_running(socket_path):
+            print(f"[ERROR] A service is already listening on {socket_path}")
+            return 1
+        os.remove(socket_path)  # left behind by a crashed service
+
+    from pipeline.hub import StreamHub
+    started = time.perf_counter()
+    hub = StreamHub(chunk_preset=chunk_preset, asr_pool_size=SERVICE_ASR_POOL)
+    hub.preload()
+
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)  # only this user may attach
+    try:
+        server.bind(socket_path)
+    finally:
+        os.umask(old_umask)
+    server.listen()
+    # Let `kill` take the same clean path as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"[Service] Ready in {time.perf_counter() - started:.1f}s, listening on {socket_path}")
+
+    try:
+        while True:
+            sock, _ = server.accept()
+            connection = ClientConnection(hub, sock)
+            threading.Thread(target=connection.serve, name="service-client", daemon=True).start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        hub.shutdown()
+        print("[Service] Stopped")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident Holoyomi service")
+    parser.add_argument("--socket", default=SERVICE_SOCKET, help="Unix socket to listen on")
+    parser.add_argument(
+        "--chunk-preset", choices=sorted(CHUNK_PRESETS), default=CHUNK_PRESET,
+        help="ASR latency/efficiency trade-off for every client",
+    )
+    args = parser.parse_args()
+    sys.exit(serve(args.socket, args.chunk_preset))
+
+
+if __name__ == "__main__":
+    main()
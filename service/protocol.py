@@ -0,0 +1,20 @@
+"""
+Wire format between the Holoyomi service and its clients: one JSON object per line
+"""
+import json
+
+
+def encode(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def decode(line):
+    return json.loads(line.decode("utf-8"))
+
+
+def segment_event(session, kind, segment):
+    """Event for a SegmentStore notification; kind is "segment" or "translation"."""
+    event = {"event": kind, "session": session, "id": segment.id, "en": segment.en}
+    if kind == "segment":
+        event.update(start=segment.start, end=segment.end, jp=segment.jp)
+    return event
@@ -0,0 +1,197 @@
+"""
+Hedged translation across backends with per-backend circuit breakers
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+
+class TranslationError(Exception):
+    """A backend failed; str(e) is the bracketed message shown in place of EN."""
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window=200, min_samples=20):
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def record(self, latency):
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, q, default=None):
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return default
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class CircuitBreaker:
+    """Stops calling a backend after repeated failures.
+
+    closed: calls allowed; `failure_threshold` consecutive failures open it.
+    open: calls rejected for `reset_timeout` seconds.
+    half-open: one trial call; success closes it, failure re-opens it.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half-open"
+                self._trial_in_flight = False
+            if self.state == "closed":
+                return True
+            if self.state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != "closed":
+                print(f"[Translation] {self.name} circuit closed")
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == "half-open" or self._failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"[Translation] {self.name} circuit opened after {self._failures} failure(s)")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+
+class Backend:
+    """A named translate function (jp -> en, raising TranslationError) plus its health stats."""
+
+    def __init__(self, name, translate_fn, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.translate_fn = translate_fn
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+
+    def __call__(self, jp_text, abandoned=None):
+        """abandoned: Event set once the caller gave up and already counted a failure."""
+        started = time.monotonic()
+        try:
+            en_text = self.translate_fn(jp_text)
+        except Exception:
+            if not (abandoned and abandoned.is_set()):
+                self.breaker.record_failure()
+            raise
+        if not (abandoned and abandoned.is_set()):
+            self.latency.record(time.monotonic() - started)
+            self.breaker.record_success()
+        return en_text
+
+
+class HedgedTranslator:
+    """Ask the primary backend; if it is slower than its own p95, also ask the secondary.
+
+    The first good answer wins. The losing request is left to finish in the
+    background so its latency still feeds the stats. A backend whose circuit
+    is open is skipped entirely, so a dead primary costs no hedge delay.
+
+    Each backend has its own worker pool, so a hedge never queues behind
+    stalled primaries. Calls still running past the timeout, including
+    losers nobody waits on any more, count as breaker failures then rather
+    than whenever they finally return.
+    """
+
+    def __init__(self, primary, secondary, min_hedge_delay=0.3, default_hedge_delay=1.5,
+                 timeout=10.0, max_workers=16):
+        self.primary = primary
+        self.secondary = secondary
+        self.min_hedge_delay = min_hedge_delay
+        self.default_hedge_delay = default_hedge_delay
+        self.timeout = timeout
+        self._executors = {
+            backend: ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hedge-{backend.name}")
+            for backend in (primary, secondary)
+        }
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._stragglers = []  # (deadline, future, backend, abandoned) of calls nobody waits on
+        self._stragglers_lock = threading.Lock()
+
+    def hedge_delay(self):
+        p95 = self.primary.latency.percentile(0.95, self.default_hedge_delay)
+        # Below the timeout, or a slow spell would stop hedging altogether
+        return min(max(self.min_hedge_delay, p95), self.timeout / 2)
+
+    def _leave(self, pending, deadline, abandoned):
+        """Stop waiting on pending calls; they count as failures once past deadline."""
+        with self._stragglers_lock:
+            self._stragglers.extend((deadline, future, backend, abandoned) for future, backend in pending.items())
+        self._sweep()
+
+    def _sweep(self):
+        now = time.monotonic()
+        with self._stragglers_lock:
+            overdue = [s for s in self._stragglers if s[0] <= now or s[1].done()]
+            self._stragglers = [s for s in self._stragglers if not (s[0] <= now or s[1].done())]
+        for _, future, backend, abandoned in overdue:
+            if future.done():
+                continue
+            abandoned.set()
+            if not (future.cancel() or future.done()):
+                backend.breaker.record_failure()
+
+    def translate(self, jp_text):
+        self._sweep()
+        if self.primary.breaker.allow():
+            first, hedge = self.primary, self.secondary
+        elif self.secondary.breaker.allow():
+            first, hedge = self.secondary, None
+        else:
+            raise TranslationError("[Translation Unavailable]")
+
+        now = time.monotonic()
+        deadline = now + self.timeout
+        hedge_at = now + self.hedge_delay()
+        abandoned = threading.Event()
+        pending = {self._executors[first].submit(first, jp_text, abandoned): first}
+        last_error = TranslationError("[Translation Timeout]")
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            wake_at = min(hedge_at, deadline) if hedge else deadline
+            done, _ = wait(pending, timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                backend = pending.pop(future)
+                try:
+                    en_text = future.result()
+                except Exception as e:
+                    last_error = e if isinstance(e, TranslationError) else TranslationError("[Translation Failed]")
+                    continue
+                if backend is not first:
+                    self.hedges_won += 1
+                self._leave(pending, deadline, abandoned)
+                return en_text
+            # Hedge once the primary is past its p95, or straight away if it failed
+            if hedge and (not pending or time.monotonic() >= hedge_at):
+                if hedge.breaker.allow():
+                    pending[self._executors[hedge].submit(hedge, jp_text, abandoned)] = hedge
+                    self.hedges_sent += 1
+                hedge = None
+        self._leave(pending, deadline, abandoned)
+        raise last_error
@@ -1,32 +1,128 @@
-<<<<<<< HEAD
+import asyncio
+import inspect
 import requests
 import os
 import time
+import threading
+from collections import OrderedDict
 from googletrans import Translator as GoogleTranslator
 
-# Translation cache
-_translation_cache = {}
+from config import (
+    TRANSLATION_MAX_RETRIES, TRANSLATION_TIMEOUT, TRANSLATION_BACKOFF_BASE, TRANSLATION_BACKOFF_CAP,
+    DEEPL_CHAR_QUOTA, DEEPL_REQUESTS_PER_SECOND, DEEPL_BURST, DEEPL_MAX_CONCURRENCY, DEEPL_TARGET_LATENCY,
+    USE_TRANSLATION_HEDGING, HEDGE_MIN_DELAY, HEDGE_DEFAULT_DELAY, CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS, TRANSLATION_CACHE_MAX_ENTRIES,
+)
+from translate.rate_control import TokenBucket, AIMDLimiter, QuotaTracker, backoff_delay
+from translate.hedging import Backend, HedgedTranslator, TranslationError
+
+class _LRUCache(OrderedDict):
+    """Dict that keeps only the most recently used max_entries items."""
+
+    def __init__(self, max_entries):
+        super().__init__()
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self:
+                return default
+            self.move_to_end(key)
+            return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.max_entries:
+                self.popitem(last=False)
+
+
+# Translation cache, bounded so marathon streams don't grow it forever
+_translation_cache = _LRUCache(TRANSLATION_CACHE_MAX_ENTRIES)
 
 # Translation config
 DEEPL_API_KEY = os.environ.get("DEEPL_API_KEY")
 DEEPL_URL = "https://api-free.deepl.com/v2/translate"
+DEEPL_USAGE_URL = "https://api-free.deepl.com/v2/usage"
 
 _google_translator = GoogleTranslator()
 
+# Shared by every caller so all players stay inside one rate/quota budget
+_request_bucket = TokenBucket(DEEPL_REQUESTS_PER_SECOND, DEEPL_BURST)
+_concurrency = AIMDLimiter(max_limit=DEEPL_MAX_CONCURRENCY, target_latency=DEEPL_TARGET_LATENCY)
+_quota = QuotaTracker(DEEPL_CHAR_QUOTA)
+_usage_synced = threading.Event()
 
-def sync_translate_jp_to_en(jp_text: str, max_retries=2) -> str:
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def sync_deepl_usage():
+    """Seed the quota tracker with DeepL's own character count for this billing period."""
+    if not DEEPL_API_KEY or _usage_synced.is_set():
+        return
+    _usage_synced.set()
+    try:
+        response = requests.get(DEEPL_USAGE_URL, params={"auth_key": DEEPL_API_KEY}, timeout=TRANSLATION_TIMEOUT)
+        response.raise_for_status()
+        usage = response.json()
+        _quota.sync(usage.get("character_count", 0), usage.get("character_limit"))
+        print(f"[Translation] DeepL usage: {_quota.used}/{_quota.limit} chars")
+    except Exception as e:
+        print(f"[Translation Warning] Could not read DeepL usage: {e}")
+
+
+def sync_translate_jp_to_en(jp_text: str, max_retries=TRANSLATION_MAX_RETRIES) -> str:
     jp_text = jp_text.strip()
     if not jp_text:
         return ""
-    if jp_text in _translation_cache:
-        return _translation_cache[jp_text]
+    cached = _translation_cache.get(jp_text)
+    if cached is not None:
+        return cached
 
     if not DEEPL_API_KEY:
         print("[Translation Error] DeepL API key not set. Set DEEPL_API_KEY environment variable.")
         print("Example: export DEEPL_API_KEY='your-key-here'")
         return "[No API Key]"
 
+    try:
+        en_text = deepl_translate(jp_text, max_retries)
+    except TranslationError as e:
+        return str(e)
+    _translation_cache[jp_text] = en_text
+    return en_text
+
+
+def deepl_translate(jp_text: str, max_retries=TRANSLATION_MAX_RETRIES, url=None) -> str:
+    """One DeepL translation under the shared rate/concurrency/quota limits.
+
+    Raises TranslationError carrying the bracketed message to display.
+    """
+    if not DEEPL_API_KEY:
+        raise TranslationError("[No API Key]")
+    chars = len(jp_text)
+    if not _quota.try_reserve(chars):
+        print(f"[Translation Error] Character quota exhausted ({_quota.used}/{_quota.limit})")
+        raise TranslationError("[Quota Exceeded]")
+
     for attempt in range(max_retries + 1):
+        retry_after = 0.0
+        congested = False
+        _request_bucket.acquire()
+        _concurrency.acquire()
+        started = time.monotonic()
         try:
             params = {
                 "auth_key": DEEPL_API_KEY,
@@ -34,52 +130,104 @@ def sync_translate_jp_to_en(jp_text: str, max_retries=2) -> str:
                 "source_lang": "JA",
                 "target_lang": "EN"
             }
-            response = requests.post(DEEPL_URL, data=params, timeout=10)
+            response = requests.post(url or DEEPL_URL, data=params, timeout=TRANSLATION_TIMEOUT)
+            congested = response.status_code == 429 or response.status_code >= 500
             response.raise_for_status()
             data = response.json()
             translations = data.get("translations", [])
             if translations:
-                en_text = translations[0].get("text", "[No Translation]")
-                _translation_cache[jp_text] = en_text
-                return en_text
+                return translations[0].get("text", "[No Translation]")
             else:
                 print(f"[Translation Warning] No translation returned for: {jp_text}")
-                return "[No Translation]"
+                raise TranslationError("[No Translation]")
+        except TranslationError:
+            raise
         except requests.Timeout:
+            congested = True
             if attempt < max_retries:
                 print(f"[Translation] Timeout, retrying ({attempt + 1}/{max_retries})...")
-                time.sleep(0.5)
             else:
                 print(f"[Translation Error] Timeout after {max_retries} retries: {jp_text}")
-                return "[Translation Timeout]"
+                _quota.refund(chars)
+                raise TranslationError("[Translation Timeout]")
         except requests.HTTPError as e:
-            if e.response.status_code == 403:
+            status = e.response.status_code
+            if status == 403:
                 print("[Translation Error] Invalid API key or quota exceeded")
-                return "[Invalid API Key]"
-            elif e.response.status_code == 456:
+                _quota.refund(chars)
+                raise TranslationError("[Invalid API Key]")
+            elif status == 456:
                 print("[Translation Error] Quota exceeded")
-                return "[Quota Exceeded]"
+                _quota.mark_exhausted()
+                raise TranslationError("[Quota Exceeded]")
+            elif congested and attempt < max_retries:
+                retry_after = _retry_after(e.response)
+                print(f"[Translation] HTTP {status}, backing off ({attempt + 1}/{max_retries})...")
             else:
-                print(f"[Translation Error] HTTP {e.response.status_code}: {e}")
-                return f"[HTTP Error {e.response.status_code}]"
+                print(f"[Translation Error] HTTP {status}: {e}")
+                _quota.refund(chars)
+                raise TranslationError(f"[HTTP Error {status}]")
         except Exception as e:
             if attempt < max_retries:
                 print(f"[Translation] Error, retrying ({attempt + 1}/{max_retries}): {e}")
-                time.sleep(0.5)
             else:
                 print(f"[Translation Error] Failed after {max_retries} retries: {e}")
-                return "[Translation Failed]"
-    return "[Translation Failed]"
+                _quota.refund(chars)
+                raise TranslationError("[Translation Failed]")
+        finally:
+            _concurrency.release(time.monotonic() - started, congested)
+        time.sleep(max(retry_after, backoff_delay(attempt, TRANSLATION_BACKOFF_BASE, TRANSLATION_BACKOFF_CAP)))
+    _quota.refund(chars)
+    raise TranslationError("[Translation Failed]")
+
+
+def google_translate(jp_text: str) -> str:
+    """Fallback backend: googletrans (sync in 4.0.0rc1, a coroutine in newer releases)."""
+    try:
+        result = _google_translator.translate(jp_text, src="ja", dest="en")
+        if inspect.isawaitable(result):
+            result = asyncio.run(result)
+        return result.text
+    except Exception as e:
+        print(f"[Translation Error] Google fallback failed: {e}")
+        raise TranslationError("[Translation Failed]")
+
+
+_hedged_translator = HedgedTranslator(
+    Backend("DeepL", deepl_translate, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS),
+    Backend("Google", google_translate, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS),
+    min_hedge_delay=HEDGE_MIN_DELAY, default_hedge_delay=HEDGE_DEFAULT_DELAY,
+    timeout=TRANSLATION_TIMEOUT * (TRANSLATION_MAX_RETRIES + 1),
+)
+
+
+def hedged_translate_jp_to_en(jp_text: str) -> str:
+    """Like sync_translate_jp_to_en, hedging slow DeepL calls with the Google fallback."""
+    jp_text = jp_text.strip()
+    if not jp_text:
+        return ""
+    cached = _translation_cache.get(jp_text)
+    if cached is not None:
+        return cached
+    try:
+        en_text = _hedged_translator.translate(jp_text)
+    except TranslationError as e:
+        return str(e)
+    _translation_cache[jp_text] = en_text
+    return en_text
 
 
 class JPToENTranslator:
     def __init__(self):
         self.cache = _translation_cache
+        threading.Thread(target=sync_deepl_usage, daemon=True).start()
 
     def translate(self, jp_text: str) -> str:
         """
         Translate Japanese text to English.
         """
+        if USE_TRANSLATION_HEDGING:
+            return hedged_translate_jp_to_en(jp_text)
         if not DEEPL_API_KEY:
             print("[WARNING] DeepL API key not set. Translation will fail.")
             print("Set DEEPL_API_KEY environment variable to enable translation.")
@@ -93,6 +241,14 @@ class JPToENTranslator:
     def get_cache_size(self):
         """Get number of cached translations."""
         return len(_translation_cache)
-=======
-# Translation module
->>>>>>> 4c3e32737f364236d02eb6f18f7d604f08a93f41
+
+    def get_quota_status(self):
+        """Characters used/limit and the current adaptive concurrency limit."""
+        return {
+            "used": _quota.used,
+            "limit": _quota.limit,
+            "remaining": _quota.remaining,
+            "concurrency": int(_concurrency.limit),
+            "hedges_sent": _hedged_translator.hedges_sent,
+            "hedges_won": _hedged_translator.hedges_won,
+        }
@@ -0,0 +1,121 @@
+"""
+Rate, concurrency and quota control for translation API calls
+"""
+import random
+import threading
+import time
+
+
+def backoff_delay(attempt, base=0.5, cap=8.0):
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AIMDLimiter:
+    """Adaptive concurrency limit (additive increase, multiplicative decrease).
+
+    Each fast success grows the limit by 1/limit, i.e. about +1 per round of
+    requests. A throttling/server error or a response slower than twice the
+    target latency cuts it by `decrease`, at most once per observed latency so
+    one burst of failures counts as a single congestion signal.
+    """
+
+    def __init__(self, initial=2, min_limit=1, max_limit=8, target_latency=1.0, decrease=0.5):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.decrease = decrease
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, latency, congested=False):
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if congested or latency > 2 * self.target_latency:
+                if now - self._last_decrease > latency:
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+                    self._last_decrease = now
+            elif latency <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+
+class QuotaTracker:
+    """Characters consumed against a billing-period quota.
+
+    Characters are reserved before a request is sent and refunded if it
+    fails, so concurrent requests cannot overshoot the quota together.
+    """
+    WARN_AT = (0.8, 0.9, 0.95)
+
+    def __init__(self, limit_chars):
+        self.limit = limit_chars
+        self.used = 0
+        self._warned = set()
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        return max(0, self.limit - self.used)
+
+    def try_reserve(self, chars):
+        with self._lock:
+            if self.used + chars > self.limit:
+                return False
+            self.used += chars
+            self._warn()
+            return True
+
+    def refund(self, chars):
+        with self._lock:
+            self.used = max(0, self.used - chars)
+
+    def sync(self, used, limit=None):
+        """Adopt the provider's own usage numbers."""
+        with self._lock:
+            self.used = used
+            if limit:
+                self.limit = limit
+            self._warn()
+
+    def mark_exhausted(self):
+        with self._lock:
+            self.used = self.limit
+
+    def _warn(self):
+        for ratio in self.WARN_AT:
+            if self.used >= ratio * self.limit and ratio not in self._warned:
+                self._warned.add(ratio)
+                print(f"[Translation] Quota {int(ratio * 100)}% used ({self.used}/{self.limit} chars)")